@@ -1,7 +1,37 @@
+import django
 from django.apps import AppConfig
+from django.core import checks
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
     verbose_name = 'API'
+
+    def ready(self):
+        from api.checks import check_shared_cache
+        from api.signals import (MODEL_RESOURCES, bump_author_versions,
+                                 bump_catalogue_version, bump_genre_versions,
+                                 bump_model_versions, forget_changed_user)
+        from api_yamdb.db import check_connections, configure_sqlite
+        from reviews.models import Title
+        from reviews.signals import catalogue_changed
+        from users.models import CinemaUser
+
+        connection_created.connect(configure_sqlite)
+        # С Django 4.1 CONN_HEALTH_CHECKS поддерживается штатно.
+        if django.VERSION < (4, 1):
+            request_started.connect(check_connections)
+
+        checks.register(check_shared_cache, checks.Tags.caches)
+        for model in MODEL_RESOURCES:
+            post_save.connect(bump_model_versions, sender=model)
+            post_delete.connect(bump_model_versions, sender=model)
+        m2m_changed.connect(bump_genre_versions, sender=Title.genre.through)
+        catalogue_changed.connect(bump_catalogue_version)
+        post_save.connect(forget_changed_user, sender=CinemaUser)
+        post_save.connect(bump_author_versions, sender=CinemaUser)
+        post_delete.connect(forget_changed_user, sender=CinemaUser)
@@ -0,0 +1,68 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils.decorators import classonlymethod
+from rest_framework.permissions import SAFE_METHODS
+
+read_executor = None
+
+
+def get_read_executor():
+    """Пул потоков для чтения; его размер ограничивает число соединений."""
+    global read_executor
+    if read_executor is None:
+        read_executor = ThreadPoolExecutor(
+            max_workers=settings.API_ASYNC_READ_WORKERS,
+            thread_name_prefix='api-read',
+        )
+    return read_executor
+
+
+def run_view(view, request, *args, **kwargs):
+    """
+    Выполняет синхронное представление в потоке пула.
+
+    Ответ отрисовывается здесь же, чтобы сериализация не занимала
+    общий поток, в котором Django выполняет синхронный код. Соединения
+    с БД принадлежат потокам пула и закрываются по CONN_MAX_AGE.
+    """
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+class AsyncReadMixin:
+    """
+    Асинхронная точка входа для чтения под ASGI.
+
+    При API_ASYNC_READS представление становится корутиной: безопасные
+    запросы выполняются в пуле из API_ASYNC_READ_WORKERS потоков, поэтому
+    медленный клиент не держит поток, пока ждёт ответа. Изменяющие
+    запросы выполняются как обычно. Под WSGI остаётся синхронное
+    представление.
+    """
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not settings.API_ASYNC_READS:
+            return view
+
+        async def async_view(request, *args, **kwargs):
+            if request.method in SAFE_METHODS:
+                return await sync_to_async(
+                    run_view,
+                    thread_sensitive=False,
+                    executor=get_read_executor(),
+                )(view, request, *args, **kwargs)
+            return await sync_to_async(view)(request, *args, **kwargs)
+
+        return functools.update_wrapper(async_view, view)
@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import OrderedDict
+from copy import copy
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.cache import get_cache
+from users.models import CinemaUser as User
+from users.roles import Roles
+
+TOKEN_VERSION_KEY = 'api:token-version:{user_id}'
+TOKEN_CLAIMS = ('username', 'role', 'is_staff', 'token_version')
+
+
+class UserCache:
+    """
+    Ограниченный по размеру кэш пользователей внутри процесса.
+
+    Запись хранится вместе с версией токенов и живёт не дольше `timeout`
+    секунд; при переполнении вытесняются давно не использованные записи.
+    """
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id, version):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            entry_version, expires, user = entry
+            if entry_version != version or expires < time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return copy(user)
+
+    def set(self, user_id, version, user):
+        with self.lock:
+            self.entries[user_id] = (
+                version, time.monotonic() + self.timeout, copy(user)
+            )
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def discard(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache(
+    settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TIMEOUT
+)
+
+
+def get_access_token(user):
+    """Выпускает токен доступа с данными, нужными для проверки прав."""
+    token = AccessToken.for_user(user)
+    for claim in TOKEN_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+def get_token_version(user_id):
+    """
+    Текущая версия токенов пользователя или None, если он недоступен.
+
+    Значение кэшируется на TOKEN_VERSION_CACHE_TIMEOUT секунд, поэтому
+    отзыв токенов вступает в силу не позже, чем через это время.
+    """
+    cache = get_cache()
+    key = TOKEN_VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('token_version', flat=True).first()
+        if version is not None:
+            cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def load_user(user_id, version):
+    """Пользователь из кэша процесса или из БД при промахе."""
+    user = user_cache.get(user_id, version)
+    if user is None:
+        user = User.objects.filter(pk=user_id, is_active=True).first()
+        if user is not None:
+            user_cache.set(user_id, version, user)
+    return user
+
+
+def forget_user(user_id):
+    """
+    Убирает пользователя из кэшей после изменения или удаления.
+
+    Версия токенов перечитывается из БД при следующем запросе, поэтому
+    отзыв токенов при смене прав вступает в силу сразу.
+    """
+    user_cache.discard(user_id)
+    get_cache().delete(TOKEN_VERSION_KEY.format(user_id=user_id))
+
+
+class CinemaTokenUser(TokenUser):
+    """Пользователь, восстановленный из данных токена без запроса к БД."""
+
+    @cached_property
+    def role(self):
+        return self.token.get('role', Roles.USER.value)
+
+    @property
+    def is_admin(self):
+        return self.role == Roles.ADMIN.value or self.is_staff
+
+    @property
+    def is_moderator(self):
+        return self.role == Roles.MODERATOR.value
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без загрузки пользователя из БД.
+
+    Токены с данными о роли превращаются в CinemaTokenUser после проверки
+    версии токенов. Для токенов без этих данных пользователь берётся из
+    кэша процесса по id и версии токенов, а из БД — только при промахе.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        version = get_token_version(user_id)
+        if version is None:
+            raise AuthenticationFailed(
+                'Пользователь не найден.', code='user_not_found'
+            )
+        if any(claim not in validated_token for claim in TOKEN_CLAIMS):
+            return load_user(user_id, version)
+        if version != validated_token['token_version']:
+            raise AuthenticationFailed(
+                'Токен отозван, получите новый.', code='token_revoked'
+            )
+        return CinemaTokenUser(validated_token)
@@ -0,0 +1,178 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from api.routing import pin_after_change
+
+VERSION_KEY = 'api:version:{resource}'
+MODIFIED_KEY = 'api:modified:{resource}'
+RESPONSE_KEY = 'api:response:{name}:{digest}'
+# Общий ресурс всех ответов: сбрасывается после массовой загрузки.
+CATALOGUE = 'catalogue'
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def get_versions(*resources):
+    """
+    Возвращает версии ресурсов и время их последнего изменения.
+
+    Все ключи читаются одним обращением к кэшу. Отсутствующая версия
+    заводится от текущего времени, а не с нуля: так после вытеснения ключа
+    старые ответы не станут снова актуальными.
+    """
+    cache = get_cache()
+    keys = [VERSION_KEY.format(resource=resource) for resource in resources]
+    modified_keys = [
+        MODIFIED_KEY.format(resource=resource) for resource in resources
+    ]
+    values = cache.get_many(keys + modified_keys)
+    for key, modified_key in zip(keys, modified_keys):
+        if key not in values:
+            cache.add(key, time.time_ns(), timeout=None)
+            values[key] = cache.get(key)
+        if modified_key not in values:
+            cache.add(modified_key, time.time(), timeout=None)
+            values[modified_key] = cache.get(modified_key)
+    last_modified = max(
+        (values[key] or 0 for key in modified_keys), default=None
+    )
+    return [values[key] for key in keys], last_modified
+
+
+def bump_versions(*resources):
+    """Увеличивает версии ресурсов, чтобы их кэшированные ответы устарели."""
+    cache = get_cache()
+    now = time.time()
+    for resource in resources:
+        key = VERSION_KEY.format(resource=resource)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+        cache.set(MODIFIED_KEY.format(resource=resource), now, timeout=None)
+
+
+def bump_versions_on_commit(*resources):
+    """Сбрасывает версии после фиксации транзакции с изменениями."""
+    transaction.on_commit(lambda: bump_versions(*resources))
+
+
+class VersionedResourceMixin:
+    """
+    Связывает ответы вьюсета с версиями ресурсов в кэше.
+
+    `cache_resources` перечисляет ресурсы, от которых зависит ответ.
+    Версии сбрасываются сигналами моделей (api.signals), поэтому ответы
+    устаревают при любом изменении через ORM, а не только через API.
+    Для этого кэш должен быть общим для всех процессов.
+    """
+
+    cache_resources = ()
+
+    def get_cache_resources(self):
+        return self.cache_resources
+
+    def get_resource_versions(self):
+        """
+        Версии ресурсов запроса, прочитанные один раз на запрос.
+
+        Версии читаются до обращения к базе, поэтому свежеизменённые
+        ресурсы успевают направить запрос с отстающей реплики на основную.
+        """
+        if not hasattr(self, '_resource_versions'):
+            self._resource_versions = get_versions(
+                CATALOGUE, *self.get_cache_resources()
+            )
+            pin_after_change(self._resource_versions[1])
+        return self._resource_versions
+
+    def get_request_fingerprint(self, request):
+        versions, _ = self.get_resource_versions()
+        return hashlib.md5(
+            f'{request.accepted_renderer.format}:'
+            f'{request.build_absolute_uri()}:'
+            f'{".".join(map(str, versions))}'.encode()
+        ).hexdigest()
+
+
+class ConditionalGetMixin(VersionedResourceMixin):
+    """
+    Отдаёт ETag и Last-Modified и отвечает 304 на условные GET-запросы.
+
+    Отпечаток строится по версиям ресурсов без обращения к базе данных,
+    поэтому неизменившаяся страница не запрашивается и не сериализуется.
+    """
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        etag = quote_etag(self.get_request_fingerprint(request))
+        _, last_modified = self.get_resource_versions()
+        last_modified = int(last_modified)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        else:
+            response = Response(status=response.status_code)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class CachedResponseMixin(VersionedResourceMixin):
+    """Кэширует ответы GET-запросов с ключом по версиям ресурсов."""
+
+    def get_cache_key(self, request):
+        return RESPONSE_KEY.format(
+            name=f'{self.basename}-{self.action}',
+            digest=self.get_request_fingerprint(request),
+        )
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        return response
+
+
+class CachedListMixin(CachedResponseMixin):
+    """Кэширует ответы действия `list`."""
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    """Кэширует ответы действия `retrieve`."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
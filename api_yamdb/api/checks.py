@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.checks import Error
+
+# Кэши, которые живут в памяти одного процесса.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+HINT = (
+    'Задайте CACHE_BACKEND и CACHE_LOCATION общего кэша, '
+    'например PyMemcacheCache или DatabaseCache.'
+)
+
+
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Кэш API должен быть общим для процессов в production и с репликами.
+
+    Иначе запись в одном процессе не сбрасывает версии ресурсов
+    в остальных, и они отвечают 304 и отдают устаревшие ответы, а метка
+    недавней записи не уводит чтение с отстающей реплики.
+    """
+    backend = settings.CACHES[settings.API_CACHE_ALIAS]['BACKEND']
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    errors = []
+    if settings.API_AUTH_PROFILE == 'production':
+        errors.append(Error(
+            f'Кэш API `{settings.API_CACHE_ALIAS}` хранится в памяти '
+            'процесса.',
+            hint=HINT,
+            id='api.E001',
+        ))
+    if settings.DATABASE_REPLICAS:
+        errors.append(Error(
+            'Реплики БД настроены, а кэш API хранится в памяти процесса.',
+            hint=HINT,
+            id='api.E002',
+        ))
+    return errors
@@ -0,0 +1,186 @@
+from collections import defaultdict
+from operator import attrgetter
+
+from django.conf import settings
+from django.db import models
+from rest_framework import serializers
+
+from api.sparse import SPARSE_ACTIONS
+
+# Поля сериализатора, чьё представление совпадает со значением из БД.
+NATIVE_FIELDS = (
+    (serializers.IntegerField, (models.IntegerField,)),
+    (serializers.CharField, (models.CharField, models.TextField)),
+)
+
+
+def is_native(field, model_field):
+    return any(
+        type(field) is field_class and isinstance(model_field, model_classes)
+        for field_class, model_classes in NATIVE_FIELDS
+    )
+
+
+def unique(items):
+    return list(dict.fromkeys(items))
+
+
+class FastReadSerializer:
+    """
+    Сериализатор только для чтения по строкам values_list(named=True).
+
+    Повторяет вывод `serializer_class`: порядок и состав полей, а также
+    преобразования берутся из его полей, но выполняются один раз на
+    запрос, а не на каждую строку. Значения, которые DRF отдаёт как есть
+    (целые числа, строки, слаги связей), копируются без вызова
+    to_representation. Вложенный объект по внешнему ключу читается
+    из той же строки, а связь «многие ко многим» — одним запросом на
+    страницу.
+    """
+
+    serializer_class = None
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    def get_fields(self):
+        return self.serializer_class(context=self.context).fields
+
+    @property
+    def model(self):
+        return self.serializer_class.Meta.model
+
+    def get_columns(self):
+        """Столбцы values_list для полей ответа."""
+        columns = ['pk']
+        for field in self.get_fields().values():
+            if isinstance(field, serializers.ListSerializer):
+                continue
+            if isinstance(field, serializers.BaseSerializer):
+                columns.append(field.source)
+                columns += [
+                    f'{field.source}__{child.source}'
+                    for child in field.fields.values()
+                ]
+            elif isinstance(field, serializers.SlugRelatedField):
+                columns.append(f'{field.source}__{field.slug_field}')
+            else:
+                columns.append(field.source)
+        return columns
+
+    def get_rows(self, queryset, extra=()):
+        """Превращает выборку в строки с нужными столбцами."""
+        return queryset.prefetch_related(None).values_list(
+            *unique([*self.get_columns(), *extra]), named=True
+        )
+
+    def compile_value(self, model, column, field):
+        getter = attrgetter(column)
+        if isinstance(field, serializers.RelatedField) or is_native(
+            field, model._meta.get_field(field.source)
+        ):
+            return getter
+        convert = field.to_representation
+
+        def get_value(row):
+            value = getter(row)
+            return None if value is None else convert(value)
+        return get_value
+
+    def compile_nested(self, field):
+        getter = attrgetter(field.source)
+        model = field.Meta.model
+        accessors = [
+            (name, self.compile_value(
+                model, f'{field.source}__{child.source}', child
+            ))
+            for name, child in field.fields.items()
+        ]
+
+        def get_value(row):
+            if getter(row) is None:
+                return None
+            return {name: get(row) for name, get in accessors}
+        return get_value
+
+    def compile_many(self, field, rows):
+        """Загружает связь «многие ко многим» для всей страницы."""
+        child = field.child
+        relation = self.model._meta.get_field(field.source)
+        lookup = relation.related_query_name()
+        columns = [child_field.source for child_field in child.fields.values()]
+        accessors = [
+            (name, self.compile_value(relation.related_model, source, value))
+            for (name, value), source in zip(child.fields.items(), columns)
+        ]
+        related = defaultdict(list)
+        for row in relation.related_model.objects.filter(**{
+            f'{lookup}__in': [row.pk for row in rows]
+        }).values_list(lookup, *columns, named=True):
+            related[getattr(row, lookup)].append(
+                {name: get(row) for name, get in accessors}
+            )
+        return lambda row: related.get(row.pk, [])
+
+    def compile(self, rows):
+        accessors = []
+        for name, field in self.get_fields().items():
+            if isinstance(field, serializers.ListSerializer):
+                accessors.append((name, self.compile_many(field, rows)))
+            elif isinstance(field, serializers.BaseSerializer):
+                accessors.append((name, self.compile_nested(field)))
+            elif isinstance(field, serializers.SlugRelatedField):
+                accessors.append(
+                    (name, attrgetter(f'{field.source}__{field.slug_field}'))
+                )
+            else:
+                accessors.append(
+                    (name, self.compile_value(self.model, field.source, field))
+                )
+        return accessors
+
+    @property
+    def data(self):
+        rows = list(self.instance) if self.many else [self.instance]
+        accessors = self.compile(rows)
+        data = [
+            {name: get(row) for name, get in accessors} for row in rows
+        ]
+        return data if self.many else data[0]
+
+
+class FastReadMixin:
+    """
+    Отдаёт list и retrieve через `fast_serializer_class`.
+
+    Выборка превращается в строки values_list после фильтрации, поэтому
+    фильтры, поиск и пагинация работают с обычным QuerySet. Столбцы
+    сортировки пагинатора добавляются к строкам для курсора.
+    """
+
+    fast_serializer_class = None
+    fast_actions = SPARSE_ACTIONS
+
+    def use_fast_serializer(self):
+        return (
+            settings.API_FAST_SERIALIZERS and self.action in self.fast_actions
+        )
+
+    def get_serializer_class(self):
+        if self.use_fast_serializer():
+            return self.fast_serializer_class
+        return super().get_serializer_class()
+
+    def get_fast_queryset(self, queryset):
+        """Строки для быстрого сериализатора или исходная выборка."""
+        if not self.use_fast_serializer():
+            return queryset
+        return self.get_serializer().get_rows(queryset, extra=[
+            field.lstrip('-')
+            for field in getattr(self.paginator, 'ordering', ())
+        ])
+
+    def filter_queryset(self, queryset):
+        return self.get_fast_queryset(super().filter_queryset(queryset))
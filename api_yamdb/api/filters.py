@@ -1,19 +1,30 @@
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
 
-from reviews.models import Title
+from reviews.models import Category, Genre, Title
+
+MATCH_ALL = 'all'
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    """Фильтр по списку значений через запятую."""
 
 
 class TitleFilter(filters.FilterSet):
-    """Фильтр произведения."""
+    """
+    Фильтр произведения.
 
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains',
-    )
-    category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains',
-    )
+    Жанры и категории ищутся по точному слагу, можно передать несколько
+    через запятую. Слаги сначала переводятся в id, затем жанры проверяются
+    через EXISTS по промежуточной таблице без размножения строк JOIN-ом.
+    Параметр `genre_match=all` требует наличия всех жанров сразу.
+    """
+
+    genre = CharInFilter(method='filter_genre')
+    category = CharInFilter(method='filter_category')
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='icontains',
@@ -22,3 +33,55 @@ class TitleFilter(filters.FilterSet):
     class Meta:
         fields = ['name', 'year', 'genre', 'category']
         model = Title
+
+    @staticmethod
+    def get_ids(model, slugs):
+        return set(
+            model.objects.filter(slug__in=slugs).values_list('id', flat=True)
+        )
+
+    def filter_genre(self, queryset, name, value):
+        slugs = set(value)
+        ids = self.get_ids(Genre, slugs)
+        genre_titles = Title.genre.through.objects.filter(
+            title_id=OuterRef('pk')
+        )
+        if self.data.get('genre_match') == MATCH_ALL:
+            if len(ids) < len(slugs):
+                return queryset.none()
+            for genre_id in ids:
+                queryset = queryset.filter(
+                    Exists(genre_titles.filter(genre_id=genre_id))
+                )
+            return queryset
+        return queryset.filter(Exists(genre_titles.filter(genre_id__in=ids)))
+
+    def filter_category(self, queryset, name, value):
+        return queryset.filter(
+            category_id__in=self.get_ids(Category, set(value))
+        )
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """
+    Полнотекстовый поиск произведений с сортировкой по релевантности.
+
+    Курсорная пагинация сортирует по своему ключу и потеряла бы порядок
+    релевантности, поэтому вместе с поиском она не принимается.
+    """
+
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        cursor_param = getattr(view.paginator, 'cursor_query_param', None)
+        if cursor_param in request.query_params:
+            raise ValidationError({cursor_param: [
+                'Результаты поиска нельзя листать курсором: используйте '
+                'limit и offset.'
+            ]})
+        return queryset.search(query).order_by(
+            '-search_rank', *queryset.query.order_by
+        )
@@ -0,0 +1,75 @@
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import BaseCommand
+from django.db import connections
+from django.test import RequestFactory
+
+HOST = 'localhost'
+
+
+def request(handler, url, **headers):
+    """
+    Выполняет запрос через WSGI-обработчик, как это делает сервер.
+
+    В отличие от тестового клиента, обработчик закрывает соединения с БД
+    по окончании запроса в соответствии с CONN_MAX_AGE.
+    """
+    environ = RequestFactory().get(url, HTTP_HOST=HOST, **headers).environ
+    response = handler(environ, lambda status, response_headers: None)
+    try:
+        return b''.join(response)
+    finally:
+        response.close()
+
+
+def run_benchmark(urls, requests, **headers):
+    """Выполняет запросы к адресам по кругу и возвращает запросы в секунду."""
+    handler = WSGIHandler()
+    for url in urls:
+        request(handler, url, **headers)
+    started = time.perf_counter()
+    for number in range(requests):
+        request(handler, urls[number % len(urls)], **headers)
+    return requests / (time.perf_counter() - started)
+
+
+class Command(BaseCommand):
+    help = "Measure API requests per second with and without persistent DB "\
+        "connections"
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='+', help='Адреса GET-запросов')
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Количество запросов в одном прогоне',
+        )
+        parser.add_argument(
+            '--conn-max-age',
+            type=int,
+            action='append',
+            help='CONN_MAX_AGE для прогона; можно указать несколько раз',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Прогоняет запросы при разных CONN_MAX_AGE.
+
+        По умолчанию сравниваются соединение на каждый запрос (0) и
+        значение из настроек. Запросы идут прямо в WSGI-обработчик,
+        без сети, поэтому разница отражает стоимость подключения к БД.
+        """
+        configured = settings.DATABASES['default']['CONN_MAX_AGE']
+        for max_age in options['conn_max_age'] or [0, configured]:
+            connections.close_all()
+            for connection in connections.all():
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+            rate = run_benchmark(options['urls'], options['requests'])
+            self.stdout.write(
+                f"CONN_MAX_AGE={max_age}: {rate:.0f} запросов/с"
+            )
+        for connection in connections.all():
+            connection.settings_dict['CONN_MAX_AGE'] = configured
@@ -0,0 +1,74 @@
+import io
+import timeit
+from itertools import cycle, islice
+
+from django.core.management import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONParser, FastJSONRenderer, orjson
+from api.serializers import TitleReadSerializer
+from api.views import TitleViewSet
+
+
+def measure(func, repeat):
+    """Среднее время вызова в миллисекундах; сборщик мусора отключён."""
+    return timeit.timeit(func, number=repeat) / repeat * 1000
+
+
+class Command(BaseCommand):
+    help = "Compare JSON renderers on a page of serialized titles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=1000,
+            help='Количество произведений на странице',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='Количество повторов для усреднения',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Сериализует страницу произведений и замеряет рендеринг и разбор.
+
+        Если произведений в базе меньше, чем нужно, страница дополняется
+        повторами уже сериализованных записей.
+        """
+        results = TitleReadSerializer(
+            TitleViewSet.queryset[:options['titles']], many=True
+        ).data
+        if not results:
+            raise CommandError('В базе нет произведений; загрузите csv_load')
+        page = {
+            'count': options['titles'],
+            'next': None,
+            'previous': None,
+            'results': list(islice(cycle(results), options['titles'])),
+        }
+        body = JSONRenderer().render(page)
+        if FastJSONRenderer().render(page) != body:
+            raise CommandError('Вывод рендереров различается')
+        self.stdout.write(
+            f"Страница: {options['titles']} произведений, {len(body)} байт; "
+            f"orjson {'установлен' if orjson else 'не установлен'}"
+        )
+        for name, renderer in (
+            ('JSONRenderer', JSONRenderer()),
+            ('FastJSONRenderer', FastJSONRenderer()),
+        ):
+            elapsed = measure(lambda: renderer.render(page), options['repeat'])
+            self.stdout.write(f"{name}: {elapsed:.2f} мс")
+        for name, parser in (
+            ('JSONParser', JSONParser()),
+            ('FastJSONParser', FastJSONParser()),
+        ):
+            elapsed = measure(
+                lambda: parser.parse(io.BytesIO(body)), options['repeat']
+            )
+            self.stdout.write(f"{name}: {elapsed:.2f} мс")
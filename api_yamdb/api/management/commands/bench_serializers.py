@@ -0,0 +1,87 @@
+import timeit
+
+from django.core.management import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from api.serializers import (CommentFastSerializer, CommentSerializer,
+                             ReviewFastSerializer, ReviewSerializer,
+                             TitleFastSerializer, TitleReadSerializer)
+from reviews.models import Comment, Review, Title
+
+BENCHMARKS = (
+    (
+        'titles',
+        Title.objects.select_related('category').prefetch_related('genre'),
+        TitleReadSerializer,
+        TitleFastSerializer,
+    ),
+    (
+        'reviews',
+        Review.objects.select_related('author'),
+        ReviewSerializer,
+        ReviewFastSerializer,
+    ),
+    (
+        'comments',
+        Comment.objects.select_related('author'),
+        CommentSerializer,
+        CommentFastSerializer,
+    ),
+)
+
+
+def serialize_models(queryset, serializer_class, rows):
+    return serializer_class(queryset.order_by('pk')[:rows], many=True).data
+
+
+def serialize_rows(queryset, serializer_class, rows):
+    serializer = serializer_class(many=True)
+    serializer.instance = serializer.get_rows(queryset.order_by('pk'))[:rows]
+    return serializer.data
+
+
+class Command(BaseCommand):
+    help = "Compare per-row cost of ModelSerializer and fast serializers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100,
+            help='Количество записей на странице',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='Количество повторов для усреднения',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Сериализует страницу каждого типа обоими способами.
+
+        Время включает запросы к БД: быстрый путь читает меньше столбцов
+        и не создаёт экземпляры моделей. Перед замером вывод обоих путей
+        сравнивается байт в байт.
+        """
+        renderer = JSONRenderer()
+        for name, queryset, slow, fast in BENCHMARKS:
+            rows = queryset[:options['rows']].count()
+            if renderer.render(
+                serialize_models(queryset, slow, rows)
+            ) != renderer.render(serialize_rows(queryset, fast, rows)):
+                raise CommandError(f'Вывод сериализаторов {name} различается')
+            if not rows:
+                self.stdout.write(f'{name}: нет записей, пропущено')
+                continue
+            self.stdout.write(f'{name}: {rows} записей на странице')
+            for label, func, serializer_class in (
+                (slow.__name__, serialize_models, slow),
+                (fast.__name__, serialize_rows, fast),
+            ):
+                elapsed = timeit.timeit(
+                    lambda: func(queryset, serializer_class, rows),
+                    number=options['repeat'],
+                ) / options['repeat'] / rows * 10 ** 6
+                self.stdout.write(f'  {label}: {elapsed:.1f} мкс на запись')
@@ -0,0 +1,196 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, LimitOffsetPagination,
+                                       PageNumberPagination)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+INVALID_CURSOR_MESSAGE = 'Некорректный курсор.'
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу (keyset) с включением через параметр `cursor`.
+
+    Без параметра `cursor` запрос обслуживает `fallback_class`, поэтому
+    существующие клиенты получают прежний формат ответа. В режиме курсора
+    страница выбирается условием по значениям полей `ordering` последней
+    строки, без OFFSET и без COUNT(*), если клиент не передал
+    `with_count`. Значения NULL в полях сортировки всегда идут последними.
+    """
+
+    ordering = ('-pk',)
+    fallback_class = PageNumberPagination
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    count_query_param = 'with_count'
+
+    def __init__(self):
+        self.fallback = None
+
+    def get_ordering(self, reverse=False):
+        """Возвращает выражения сортировки с NULL в конце страницы."""
+        expressions = []
+        for field in self.ordering:
+            descending = field.startswith('-')
+            if descending != reverse:
+                expressions.append(
+                    F(field.lstrip('-')).desc(nulls_last=not reverse)
+                )
+            else:
+                expressions.append(
+                    F(field.lstrip('-')).asc(nulls_first=reverse)
+                )
+        return expressions
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        self.count = (
+            queryset.count()
+            if request.query_params.get(self.count_query_param)
+            else None
+        )
+
+        queryset = queryset.order_by(*self.get_ordering(reverse))
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_position_filter(queryset.model, position, reverse)
+            )
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_position_filter(self, model, position, reverse):
+        """
+        Строит условие «строго после позиции» для составного ключа.
+
+        Для ключа (a, b) это `a > x OR (a = x AND b > y)` с учётом
+        направления сортировки каждого поля и NULL в конце.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            try:
+                value = model._meta.get_field(
+                    model._meta.pk.name if name == 'pk' else name
+                ).to_python(value)
+            except (ValidationError, TypeError):
+                raise NotFound(INVALID_CURSOR_MESSAGE)
+            descending = field.startswith('-') != reverse
+            condition |= equal & self.get_after_filter(
+                name, value, descending, reverse
+            )
+            equal &= Q(
+                **{f'{name}__isnull': True} if value is None else {name: value}
+            )
+        return condition
+
+    @staticmethod
+    def get_after_filter(name, value, descending, reverse):
+        """Условие «после значения» для одного поля ключа."""
+        nulls = Q(**{f'{name}__isnull': True})
+        if value is None:
+            return ~nulls if reverse else Q(pk__in=[])
+        after = Q(**{f'{name}__lt' if descending else f'{name}__gt': value})
+        return after if reverse else after | nulls
+
+    def decode_cursor(self, request):
+        encoded = request.query_params[self.cursor_query_param]
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(b64decode(encoded.encode('ascii')).decode())
+            position, reverse = data['p'], bool(data['r'])
+        except (BinasciiError, UnicodeError, ValueError, KeyError,
+                TypeError):
+            raise NotFound(INVALID_CURSOR_MESSAGE)
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ):
+            raise NotFound(INVALID_CURSOR_MESSAGE)
+        return position, reverse
+
+    def encode_cursor(self, instance, reverse):
+        position = [
+            getattr(instance, field.lstrip('-')) for field in self.ordering
+        ]
+        data = json.dumps(
+            {'p': position, 'r': int(reverse)},
+            default=lambda value: value.isoformat(),
+        )
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            b64encode(data.encode()).decode('ascii'),
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        response = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            response = {'count': self.count, **response}
+        return Response(response)
+
+
+class TitlePagination(KeysetPagination):
+    """Пагинация произведений: limit/offset или курсор по рейтингу."""
+
+    ordering = ('-rating', 'name', 'pk')
+    fallback_class = LimitOffsetPagination
+
+
+class PubDatePagination(KeysetPagination):
+    """Пагинация отзывов и комментариев: страницы или курсор по дате."""
+
+    ordering = ('-pub_date', '-pk')
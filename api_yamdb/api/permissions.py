@@ -52,6 +52,7 @@ class IsAuthorOrReadOnly(permissions.BasePermission):
         return (
             request.method in permissions.SAFE_METHODS
             or request.user.is_authenticated
-            and (request.user == obj.author or request.user.is_moderator
+            and (request.user.pk == obj.author_id
+                 or request.user.is_moderator
                  or request.user.is_admin)
         )
@@ -0,0 +1,157 @@
+import asyncio
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import LazyObject
+from rest_framework.permissions import SAFE_METHODS
+
+PRIMARY = 'default'
+STICKY_KEY = 'api:primary:{user_id}'
+
+request_state = ContextVar('request_state', default=None)
+
+
+def get_sticky_cache():
+    """Общий кэш API: метка записи должна быть видна всем процессам."""
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def pin_after_change(modified):
+    """
+    Читает запрос с основной базы, если данные недавно менялись.
+
+    `modified` — время последнего изменения ресурсов ответа. Пока реплика
+    может отставать на REPLICA_STICKY_SECONDS, её ответ нельзя кэшировать
+    и помечать ETag новой версии, поэтому такие запросы идут в основную.
+    """
+    state = request_state.get()
+    if (
+        state is not None
+        and settings.DATABASE_REPLICAS
+        and time.time() - modified < settings.REPLICA_STICKY_SECONDS
+    ):
+        state.pinned = True
+
+
+def get_request_user(request):
+    """
+    Пользователь запроса, если он уже известен.
+
+    Ленивый пользователь из сессии не вычисляется: это запрос к БД,
+    который снова пришёл бы в маршрутизатор.
+    """
+    user = request.__dict__.get('user')
+    if user is None or isinstance(user, LazyObject):
+        return None
+    return user if user.is_authenticated else None
+
+
+class RequestState:
+    """Решение о чтении с основной базы в рамках одного запроса."""
+
+    def __init__(self, request):
+        self.request = request
+        self.pinned = request.method not in SAFE_METHODS
+        self.user_checked = False
+
+    def use_primary(self):
+        """
+        Читать ли с основной базы.
+
+        Изменяющие запросы всегда работают с основной базой. Безопасные
+        запросы читают с неё, если пользователь недавно что-то менял,
+        чтобы сразу видеть свои записи, пока реплика догоняет.
+        """
+        if self.pinned or self.user_checked:
+            return self.pinned
+        user = get_request_user(self.request)
+        if user is not None:
+            self.user_checked = True
+            self.pinned = bool(
+                get_sticky_cache().get(STICKY_KEY.format(user_id=user.pk))
+            )
+        return self.pinned
+
+    def remember_write(self):
+        user = get_request_user(self.request)
+        if user is not None:
+            get_sticky_cache().set(
+                STICKY_KEY.format(user_id=user.pk),
+                True,
+                settings.REPLICA_STICKY_SECONDS,
+            )
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Сохраняет состояние запроса для маршрутизатора реплик.
+
+    Поддерживает и синхронный, и асинхронный стек, чтобы под ASGI
+    не переводить остальную цепочку в синхронный поток.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        state = RequestState(request)
+        token = request_state.set(state)
+        try:
+            response = self.get_response(request)
+            self.process_response(state, request, response)
+            return response
+        finally:
+            request_state.reset(token)
+
+    async def __acall__(self, request):
+        state = RequestState(request)
+        token = request_state.set(state)
+        try:
+            response = await self.get_response(request)
+            if request.method not in SAFE_METHODS:
+                await sync_to_async(self.process_response)(
+                    state, request, response
+                )
+            return response
+        finally:
+            request_state.reset(token)
+
+    @staticmethod
+    def process_response(state, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            state.remember_write()
+
+
+class ReplicaRouter:
+    """
+    Направляет чтение безопасных запросов на реплики, запись — в основную.
+
+    Вне HTTP-запроса (команды, консоль) всё идёт в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        state = request_state.get()
+        if not replicas or state is None or state.use_primary():
+            return PRIMARY
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
@@ -1,9 +1,17 @@
+from django.conf import settings
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
-from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework.settings import api_settings
 
+from api.authentication import get_access_token
+from api.fast_serializers import FastReadSerializer
+from api.sparse import SparseFieldsSerializerMixin
 from api.utils import generate_confirmation_code, send_confirmation_email
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.constants import CONST_EMAIL_LENGTH, CONST_USERNAME_LENGTH
@@ -11,7 +19,8 @@ from users.models import CinemaUser as User
 from users.validators import validate_username_me
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsSerializerMixin,
+                       serializers.ModelSerializer):
     """Сериализатор для отзывов."""
 
     author = serializers.SlugRelatedField(
@@ -23,21 +32,26 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date')
 
-    def validate(self, data):
-        """Метод для валидации данных."""
-
-        request = self.context['request']
-        if request.method == 'POST':
-            user = request.user
-            title_id = request.parser_context['kwargs']['title_id']
-            if Review.objects.filter(title_id=title_id, author=user).exists():
-                raise ValidationError(
+    def create(self, validated_data):
+        """
+        Создаёт отзыв, полагаясь на ограничение unique_review в БД.
+
+        Повторный отзыв отклоняется по IntegrityError без отдельного
+        запроса на проверку и без гонки между параллельными запросами.
+        """
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
                     'Вы уже оставляли отзыв на это произведение'
-                )
-        return data
+                ]
+            })
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
     """Сериализатор для комментариев."""
 
     author = serializers.SlugRelatedField(
@@ -50,6 +64,18 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date')
 
 
+class ReviewFastSerializer(FastReadSerializer):
+    """Быстрое чтение отзывов в формате ReviewSerializer."""
+
+    serializer_class = ReviewSerializer
+
+
+class CommentFastSerializer(FastReadSerializer):
+    """Быстрое чтение комментариев в формате CommentSerializer."""
+
+    serializer_class = CommentSerializer
+
+
 class CategorySerializer(serializers.ModelSerializer):
     """Сериализатор для категорий."""
 
@@ -66,7 +92,8 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(SparseFieldsSerializerMixin,
+                          serializers.ModelSerializer):
     """Сериализатор для чтения информации о произведении."""
 
     category = CategorySerializer(read_only=True)
@@ -75,7 +102,14 @@ class TitleReadSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'rating', 'description', 'genre',
+                  'category')
+
+
+class TitleFastSerializer(FastReadSerializer):
+    """Быстрое чтение произведений в формате TitleReadSerializer."""
+
+    serializer_class = TitleReadSerializer
 
 
 class TitleCreateSerializer(serializers.ModelSerializer):
@@ -97,7 +131,7 @@ class TitleCreateSerializer(serializers.ModelSerializer):
         """Метод, преобразующий данные в представление."""
 
         model = Title
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
 
     def to_representation(self, instance):
         serializer = TitleReadSerializer(instance)
@@ -138,31 +172,67 @@ class SignupSerializer(serializers.Serializer):
     )
 
     def validate(self, data):
-        if User.objects.filter(username=data.get('username'),
-                               email=data.get('email')).exists():
-            return data
-        if User.objects.filter(username=data.get('username')):
-            raise serializers.ValidationError(
-                'Данный пользователь уже существует!')
-        if User.objects.filter(email=data.get('email')):
-            raise serializers.ValidationError(
-                'Данная почта уже существует!')
+        """
+        Проверяет имя и почту одним запросом.
+
+        Выбираются все пользователи, совпавшие по имени или по почте
+        (их не больше двух), а вид конфликта определяется уже в Python.
+        """
+        username, email = data.get('username'), data.get('email')
+        self.user = None
+        conflict = None
+        for user in User.objects.filter(
+            Q(username=username) | Q(email=email)
+        ).only('username', 'email'):
+            if user.username == username and user.email == email:
+                self.user = user
+                return data
+            if user.username == username:
+                conflict = 'Данный пользователь уже существует!'
+            elif conflict is None:
+                conflict = 'Данная почта уже существует!'
+        if conflict:
+            raise serializers.ValidationError(conflict)
         return data
 
     def create(self, validated_data):
-        """Метод для создания нового пользователя."""
+        """
+        Метод для создания нового пользователя.
+
+        Код подтверждения существующему пользователю записывается одним
+        UPDATE, новый пользователь создаётся одним INSERT. Если параллельный
+        запрос успел создать того же пользователя, код обновляется у него.
+        """
         username = validated_data['username']
         email = validated_data['email']
-
-        user, _ = User.objects.get_or_create(
-            username=username,
-            email=email,
-        )
-        confirmation_code = generate_confirmation_code()
-        user.confirmation_code = confirmation_code
-        user.save()
-
-        send_confirmation_email(user.email, confirmation_code)
+        code_fields = {
+            'confirmation_code': generate_confirmation_code(),
+            'confirmation_code_issued': timezone.now(),
+            'confirmation_attempts': 0,
+        }
+        confirmation_code = code_fields['confirmation_code']
+
+        user = self.user
+        if user is None:
+            try:
+                with transaction.atomic():
+                    user = User.objects.create(
+                        username=username, email=email, **code_fields
+                    )
+            except IntegrityError:
+                user = User(username=username, email=email)
+            else:
+                send_confirmation_email(email, confirmation_code)
+                return user
+
+        if not User.objects.filter(username=username, email=email).update(
+            **code_fields
+        ):
+            raise serializers.ValidationError(
+                'Данный пользователь уже существует!')
+        for field, value in code_fields.items():
+            setattr(user, field, value)
+        send_confirmation_email(email, confirmation_code)
         return user
 
 
@@ -178,7 +248,21 @@ class CreateTokenSerializer(serializers.Serializer):
 
         user = get_object_or_404(User, username=username)
 
-        if user.confirmation_code != confirmation_code:
+        expired = (
+            user.confirmation_attempts
+            >= settings.CONFIRMATION_CODE_MAX_ATTEMPTS
+            or user.confirmation_code_issued
+            + settings.CONFIRMATION_CODE_LIFETIME < timezone.now()
+        )
+        if expired or not user.confirmation_code:
+            raise serializers.ValidationError(
+                "Код подтверждения истёк, запросите новый.")
+        if not constant_time_compare(
+            user.confirmation_code, str(confirmation_code)
+        ):
+            User.objects.filter(pk=user.pk).update(
+                confirmation_attempts=F('confirmation_attempts') + 1
+            )
             raise serializers.ValidationError(
                 "Недействительный код подтверждения.")
 
@@ -189,5 +273,5 @@ class CreateTokenSerializer(serializers.Serializer):
         """Метод для валидации данных."""
 
         user = validated_data['user']
-        token = AccessToken.for_user(user)
+        token = get_access_token(user)
         return {'access': str(token)}
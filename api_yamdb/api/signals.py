@@ -0,0 +1,59 @@
+from api.authentication import forget_user
+from api.cache import CATALOGUE, bump_versions, bump_versions_on_commit
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+def get_review_resources(review):
+    """Отзывы прежнего и нового произведения, если отзыв перенесли."""
+    title_ids = {review.title_id, getattr(review, '_loaded_title_id', None)}
+    return ('titles', *(
+        f'reviews-{title_id}' for title_id in title_ids if title_id
+    ))
+
+
+# Ресурсы кэша, которые устаревают при изменении объекта модели.
+MODEL_RESOURCES = {
+    Title: lambda title: ('titles', f'title-{title.pk}'),
+    Category: lambda category: ('categories', 'titles'),
+    Genre: lambda genre: ('genres', 'titles'),
+    Review: get_review_resources,
+    Comment: lambda comment: (f'comments-{comment.review_id}',),
+}
+
+GENRE_ACTIONS = ('post_add', 'post_remove', 'post_clear')
+
+
+def bump_model_versions(sender, instance, **kwargs):
+    """
+    Сбрасывает версии ресурсов после сохранения или удаления объекта.
+
+    Сигналы срабатывают при любом изменении через ORM: из вьюсетов,
+    админки, консоли и при каскадном удалении.
+    """
+    bump_versions_on_commit(*MODEL_RESOURCES[sender](instance))
+
+
+def bump_genre_versions(sender, action, **kwargs):
+    if action in GENRE_ACTIONS:
+        bump_versions_on_commit('titles')
+
+
+def bump_catalogue_version(sender, **kwargs):
+    """Массовая загрузка без сигналов моделей сбрасывает все ответы."""
+    bump_versions(CATALOGUE)
+
+
+def forget_changed_user(sender, instance, **kwargs):
+    """
+    Сбрасывает кэши пользователя после сохранения или удаления.
+
+    Версию токенов при смене прав увеличивает CinemaUser.save(), поэтому
+    старые токены отклоняются и после правок из админки или консоли.
+    """
+    forget_user(instance.pk)
+
+
+def bump_author_versions(sender, instance, created, **kwargs):
+    """Переименование пользователя меняет автора в отзывах и комментариях."""
+    if not created and instance.username_changed:
+        bump_versions_on_commit('users')
@@ -0,0 +1,107 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+SPARSE_ACTIONS = ('list', 'retrieve')
+
+
+def split_param(value):
+    return {field.strip() for field in value.split(',') if field.strip()}
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Оставляет в ответе только поля из `fields` контекста.
+
+    Ограничение действует на верхний уровень ответа: поля вложенных
+    сериализаторов (категория, жанры) не сокращаются.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if requested is None or parent is not None:
+            return fields
+        return {
+            name: field for name, field in fields.items() if name in requested
+        }
+
+
+class SparseFieldsMixin:
+    """
+    Разреженные ответы при чтении: `?fields=` и `?expand=`.
+
+    `?fields=id,name` сокращает ответ до перечисленных полей. Вложенные
+    объекты из `expandable_fields` при этом попадают в ответ, только если
+    перечислены в `fields` или в `?expand=`. Запрос к БД сокращается
+    вместе с ответом: `sparse_fields` связывает поле ответа с полями
+    модели для only(), связи через `__` подключаются select_related,
+    а `sparse_prefetch` выполняется, только если поле запрошено.
+    """
+
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+    sparse_fields = {}
+    sparse_prefetch = {}
+    expandable_fields = ()
+
+    def get_sparse_fields(self):
+        """Запрошенные поля ответа или None, если ответ полный."""
+        if self.action not in SPARSE_ACTIONS:
+            return None
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = self.parse_sparse_fields(
+                self.request.query_params
+            )
+        return self._sparse_fields
+
+    def parse_sparse_fields(self, params):
+        if self.fields_query_param not in params:
+            return None
+        fields = split_param(params[self.fields_query_param])
+        expand = split_param(params.get(self.expand_query_param, ''))
+        errors = {}
+        unknown = fields - set(self.sparse_fields)
+        if unknown:
+            errors[self.fields_query_param] = [
+                f'Неизвестные поля: {", ".join(sorted(unknown))}.'
+            ]
+        unknown = expand - set(self.expandable_fields)
+        if unknown:
+            errors[self.expand_query_param] = [
+                f'Нельзя раскрыть: {", ".join(sorted(unknown))}.'
+            ]
+        if errors:
+            raise ValidationError(errors)
+        return fields | expand
+
+    def get_sparse_queryset(self, queryset):
+        """Сужает выборку до полей, нужных запрошенному ответу."""
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        only = [
+            path for field in fields for path in self.sparse_fields[field]
+        ]
+        only += [
+            field.lstrip('-')
+            for field in getattr(self.paginator, 'ordering', ())
+        ]
+        related = {path.rsplit('__', 1)[0] for path in only if '__' in path}
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*only).prefetch_related(*(
+            self.sparse_prefetch[field] for field in fields
+            if field in self.sparse_prefetch
+        ))
+
+    def get_queryset(self):
+        return self.get_sparse_queryset(super().get_queryset())
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_sparse_fields()
+        return context
@@ -0,0 +1,138 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from api.cache import get_cache
+from users.constants import CONST_USERNAME_LENGTH
+
+BUCKET_KEY = 'api:bucket:{key}'
+
+
+class LocMemBucketStore:
+    """
+    Хранит корзины токенов в памяти процесса.
+
+    Счётчики не делятся между процессами, зато не требуют обращения
+    к внешнему кэшу. При переполнении вытесняются давно не
+    использованные корзины: полная корзина равна отсутствующей.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, rate):
+        with self.lock:
+            tokens, updated = self.buckets.pop(key, (capacity, None))
+            tokens, wait = take_token(tokens, updated, capacity, rate)
+            self.buckets[key] = (tokens, time.monotonic())
+            while len(self.buckets) > self.maxsize:
+                self.buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheBucketStore:
+    """
+    Хранит корзины токенов в кэше API, общем для всех процессов.
+
+    Чтение и запись состояния не атомарны, поэтому при гонке пара
+    параллельных запросов может пройти сверх лимита. Запись живёт
+    ровно столько, сколько нужно корзине, чтобы наполниться заново.
+    """
+
+    def consume(self, key, capacity, rate):
+        cache = get_cache()
+        key = BUCKET_KEY.format(key=hashlib.md5(key.encode()).hexdigest())
+        tokens, updated = cache.get(key, (capacity, None))
+        tokens, wait = take_token(tokens, updated, capacity, rate, time.time)
+        cache.set(key, (tokens, time.time()), timeout=capacity / rate + 1)
+        return wait
+
+
+def take_token(tokens, updated, capacity, rate, clock=time.monotonic):
+    """
+    Пополняет корзину за прошедшее время и забирает из неё токен.
+
+    Возвращает остаток токенов и время ожидания следующего токена;
+    нулевое ожидание означает, что запрос разрешён.
+    """
+    if updated is not None:
+        tokens = min(capacity, tokens + (clock() - updated) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / rate
+
+
+BUCKET_STORES = {
+    'locmem': LocMemBucketStore(),
+    'cache': CacheBucketStore(),
+}
+
+
+def get_bucket_store():
+    return BUCKET_STORES[settings.API_THROTTLE_STORE]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Ограничивает частоту запросов корзинами токенов по IP и по имени.
+
+    Лимиты берутся из DEFAULT_THROTTLE_RATES под ключами
+    `<scope>_ip` и `<scope>_username` в формате `число/период`: число
+    задаёт ёмкость корзины, а за период она наполняется полностью.
+    Проверка выполняется до обработчика, поэтому отклонённый запрос
+    не обращается к базе данных.
+    """
+
+    scope = None
+    durations = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+    def get_rate(self, kind):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f'{self.scope}_{kind}')
+        if rate is None:
+            return None
+        number, period = rate.split('/')
+        capacity = int(number)
+        return capacity, capacity / self.durations[period[0]]
+
+    def get_keys(self, request):
+        keys = {'ip': self.get_ident(request)}
+        data = request.data
+        username = data.get('username') if hasattr(data, 'get') else None
+        if username:
+            keys['username'] = str(username)[:CONST_USERNAME_LENGTH]
+        return keys
+
+    def allow_request(self, request, view):
+        store = get_bucket_store()
+        self.wait_time = 0
+        for kind, value in self.get_keys(request).items():
+            rate = self.get_rate(kind)
+            if rate is None:
+                continue
+            self.wait_time = max(
+                self.wait_time,
+                store.consume(f'{self.scope}:{kind}:{value}', *rate),
+            )
+        return not self.wait_time
+
+    def wait(self):
+        return self.wait_time
+
+
+class SignupThrottle(TokenBucketThrottle):
+    scope = 'signup'
+
+
+class TokenThrottle(TokenBucketThrottle):
+    scope = 'token'
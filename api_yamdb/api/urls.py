@@ -3,8 +3,8 @@ from rest_framework import routers
 from rest_framework.authtoken import views
 
 from api.views import (CategoryViewSet, CommentViewSet, CreateTokenView,
-                       GenreViewSet, ReviewViewSet, SignupView, TitleViewSet,
-                       UserViewSet)
+                       ExportView, GenreViewSet, ReviewViewSet, SignupView,
+                       TitleViewSet, UserViewSet)
 
 router = routers.DefaultRouter()
 router.register("categories", CategoryViewSet, basename="categories")
@@ -29,6 +29,7 @@ v1_urls = [
     path("", include(router.urls)),
     path("auth/", include(auth_urls)),
     path("api-token-auth/", views.obtain_auth_token),
+    path("export/<str:filename>", ExportView.as_view(), name="export"),
 ]
 
 urlpatterns = [
@@ -3,6 +3,8 @@ import random
 from django.conf import settings
 from django.core.mail import send_mail
 
+from users.outbox import enqueue_email
+
 
 def generate_confirmation_code():
     """Функция для генерации случайного кода подтверждения."""
@@ -11,10 +13,18 @@ def generate_confirmation_code():
 
 
 def send_confirmation_email(email, confirmation_code):
-    """Функция для отправки электронного письма с кодом подтверждения."""
+    """
+    Функция для отправки электронного письма с кодом подтверждения.
+
+    При EMAIL_DELIVERY = 'outbox' письмо только ставится в очередь,
+    и ответ на регистрацию не ждёт почтовый сервер.
+    """
 
     subject = 'Your confirmation code'
     message = f'Your confirmation code is {confirmation_code}'
+    if settings.EMAIL_DELIVERY == 'outbox':
+        enqueue_email(email, subject, message)
+        return
     email_from = settings.EMAIL_FROM
     recipient_list = [email]
     send_mail(subject, message, email_from, recipient_list)
@@ -1,66 +1,149 @@
-from django.db.models import Avg
+from functools import partial
+
+from django.db import transaction
+from django.db.models import BigIntegerField, Prefetch
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import (filters, generics, mixins, permissions, status,
                             viewsets)
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-
-from api.filters import TitleFilter
+from rest_framework.views import APIView
+
+from api.async_views import AsyncReadMixin
+from api.authentication import get_token_version, load_user
+from api.cache import CachedListMixin, CachedRetrieveMixin, ConditionalGetMixin
+from api.fast_serializers import FastReadMixin
+from api.filters import TitleFilter, TitleSearchFilter
+from api.pagination import PubDatePagination, TitlePagination
 from api.permissions import IsAdmin, IsAdminOrReadOnly, IsAuthorOrReadOnly
-from api.serializers import (CategorySerializer, CommentSerializer,
-                             CreateTokenSerializer, GenreSerializer,
+from api.renderers import FastJSONRenderer
+from api.serializers import (CategorySerializer, CommentFastSerializer,
+                             CommentSerializer, CreateTokenSerializer,
+                             GenreSerializer, ReviewFastSerializer,
                              ReviewSerializer, SignupSerializer,
-                             TitleCreateSerializer, TitleReadSerializer,
-                             UserSerializer)
+                             TitleCreateSerializer, TitleFastSerializer,
+                             TitleReadSerializer, UserSerializer)
+from api.sparse import SparseFieldsMixin
+from api.throttling import SignupThrottle, TokenThrottle
+from reviews.export import EXPORT_FILES, gzip_stream, iter_csv
 from reviews.models import Category, Genre, Review, Title
 from users.models import CinemaUser as User
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+def get_author_fields(user):
+    """
+    Поля автора для сохранения объекта от имени пользователя запроса.
+
+    Пользователь из токена не является экземпляром модели, поэтому для
+    него автор задаётся через id.
+    """
+    if isinstance(user, User):
+        return {'author': user}
+    return {'author_id': user.pk}
+
+
+class ReviewViewSet(AsyncReadMixin, ConditionalGetMixin, FastReadMixin,
+                    SparseFieldsMixin, viewsets.ModelViewSet):
     """Класс для работы с отзывами."""
 
     serializer_class = ReviewSerializer
+    fast_serializer_class = ReviewFastSerializer
+    pagination_class = PubDatePagination
     http_method_names = ['get', 'post', 'patch', 'delete']
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,
                           IsAuthorOrReadOnly)
+    sparse_fields = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+    }
 
     def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        """Произведение из URL, загружаемое один раз за запрос."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, id=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.get_sparse_queryset(
+            self.get_title().reviews.select_related('author').only(
+                'id', 'text', 'score', 'pub_date', 'title', 'author__username'
+            )
+        )
 
+    def get_cache_resources(self):
+        title_id = self.kwargs.get('title_id')
+        return (f'title-{title_id}', f'reviews-{title_id}', 'users')
+
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        serializer.save(**get_author_fields(self.request.user),
+                        title=self.get_title())
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(AsyncReadMixin, ConditionalGetMixin, FastReadMixin,
+                     SparseFieldsMixin, viewsets.ModelViewSet):
     """Класс для работы с комментариями."""
     serializer_class = CommentSerializer
+    fast_serializer_class = CommentFastSerializer
+    pagination_class = PubDatePagination
     http_method_names = ['get', 'post', 'patch', 'delete']
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,
                           IsAuthorOrReadOnly)
+    sparse_fields = {
+        'id': ('id',),
+        'text': ('text',),
+        'author': ('author__username',),
+        'pub_date': ('pub_date',),
+    }
 
     def get_review(self):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        title = get_object_or_404(Title, id=title_id)
-        review = get_object_or_404(Review, id=review_id, title=title)
-        return review
+        """
+        Отзыв из URL, загружаемый один раз за запрос.
+
+        Принадлежность отзыва произведению проверяется в том же запросе.
+        """
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                id=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+        return self._review
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_sparse_queryset(
+            self.get_review().comments.select_related('author').only(
+                'id', 'text', 'pub_date', 'review', 'author__username'
+            )
+        )
+
+    def get_cache_resources(self):
+        title_id = self.kwargs.get('title_id')
+        return (f'title-{title_id}', f'reviews-{title_id}',
+                f'comments-{self.kwargs.get("review_id")}', 'users')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+        serializer.save(**get_author_fields(self.request.user),
+                        review=self.get_review())
 
 
 class CreateListDestroyViewset(
+        AsyncReadMixin,
+        CachedListMixin,
         mixins.CreateModelMixin,
         mixins.ListModelMixin,
         mixins.DestroyModelMixin,
@@ -80,6 +163,7 @@ class CategoryViewSet(CreateListDestroyViewset):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (IsAdminOrReadOnly,)
+    cache_resources = ('categories',)
 
 
 class GenreViewSet(CreateListDestroyViewset):
@@ -88,23 +172,97 @@ class GenreViewSet(CreateListDestroyViewset):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (IsAdminOrReadOnly,)
+    cache_resources = ('genres',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(AsyncReadMixin, ConditionalGetMixin, CachedListMixin,
+                   CachedRetrieveMixin, FastReadMixin, SparseFieldsMixin,
+                   viewsets.ModelViewSet):
     """Класс для работы с произведениями."""
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).order_by('-rating', 'name')
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('-rating', 'name')
     permission_classes = (IsAdminOrReadOnly, )
-    pagination_class = LimitOffsetPagination
-    filter_backends = (filters.SearchFilter, DjangoFilterBackend)
+    serializer_class = TitleReadSerializer
+    fast_serializer_class = TitleFastSerializer
+    pagination_class = TitlePagination
+    filter_backends = (TitleSearchFilter, DjangoFilterBackend)
     filterset_class = TitleFilter
     http_method_names = ('get', 'post', 'patch', 'delete')
+    cache_resources = ('titles', 'categories', 'genres')
+    sparse_fields = {
+        'id': ('id',),
+        'name': ('name',),
+        'year': ('year',),
+        'rating': ('rating',),
+        'description': ('description',),
+        'genre': (),
+        'category': ('category__name', 'category__slug'),
+    }
+    sparse_prefetch = {
+        'genre': Prefetch(
+            'genre', queryset=Genre.objects.only('name', 'slug')
+        ),
+    }
+    expandable_fields = ('genre', 'category')
+    fast_actions = ('list', 'retrieve', 'batch')
+    batch_query_param = 'ids'
+    batch_max_size = 100
 
     def get_serializer_class(self):
         if self.action in ('create', 'update', 'partial_update'):
             return TitleCreateSerializer
-        return TitleReadSerializer
+        return super().get_serializer_class()
+
+    def get_batch_ids(self):
+        """Id из `?ids=` в порядке запроса, без повторов."""
+        values = [
+            value.strip() for value in self.request.query_params.get(
+                self.batch_query_param, ''
+            ).split(',') if value.strip()
+        ]
+        if not values:
+            message = 'Укажите id произведений через запятую.'
+        elif not all(
+            value.isdecimal() and int(value) <= BigIntegerField.MAX_BIGINT
+            for value in values
+        ):
+            message = 'Id произведений должны быть целыми числами.'
+        elif len(values) > self.batch_max_size:
+            message = f'Не больше {self.batch_max_size} id за запрос.'
+        else:
+            return list(dict.fromkeys(map(int, values)))
+        raise ValidationError({self.batch_query_param: [message]})
+
+    def get_batch_response(self, request):
+        ids = self.get_batch_ids()
+        titles = {
+            title.pk: title for title in self.get_fast_queryset(
+                self.get_queryset().filter(pk__in=ids)
+            )
+        }
+        serializer = self.get_serializer(
+            [titles[pk] for pk in ids if pk in titles], many=True
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in ids if pk not in titles],
+        })
+
+    @action(detail=False, url_path='batch')
+    def batch(self, request):
+        """
+        Произведения по списку id: `/titles/batch/?ids=3,1,2`.
+
+        Ответ сохраняет порядок запроса, а id, которых нет в базе,
+        перечисляются в `missing`. Произведения читаются одним запросом,
+        жанры — ещё одним.
+        """
+        return self.get_conditional_response(
+            partial(self.get_cached_response, self.get_batch_response),
+            request,
+        )
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -118,18 +276,36 @@ class UserViewSet(viewsets.ModelViewSet):
     filter_backends = (SearchFilter,)
     search_fields = ('username',)
 
+    def get_profile(self):
+        """Полный профиль текущего пользователя из кэша или БД."""
+        if isinstance(self.request.user, User):
+            return self.request.user
+        user_id = self.request.user.pk
+        user = load_user(user_id, get_token_version(user_id))
+        if user is None:
+            raise Http404
+        return user
+
     @action(detail=False, methods=['get', 'patch'],
             permission_classes=[IsAuthenticated])
     def me(self, request, *args, **kwargs):
+        """
+        Профиль текущего пользователя.
+
+        GET отдаётся из кэша, а PATCH применяется к записи, только что
+        прочитанной из БД: копия в кэше может отставать, и её сохранение
+        откатило бы роль и версию токенов.
+        """
         if request.method == 'GET':
-            serializer = self.get_serializer(request.user)
+            serializer = self.get_serializer(self.get_profile())
             return Response(serializer.data)
 
-        serializer = self.get_serializer(request.user,
+        user = get_object_or_404(User, pk=request.user.pk, is_active=True)
+        serializer = self.get_serializer(user,
                                          data=request.data,
                                          partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save(role=request.user.role)
+        serializer.save(role=user.role)
         return Response(serializer.data)
 
 
@@ -138,7 +314,8 @@ class SignupView(generics.CreateAPIView):
 
     serializer_class = SignupSerializer
     permission_classes = [permissions.AllowAny]
-    renderer_classes = [JSONRenderer]
+    renderer_classes = [FastJSONRenderer]
+    throttle_classes = [SignupThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -153,10 +330,32 @@ class CreateTokenView(generics.CreateAPIView):
 
     serializer_class = CreateTokenSerializer
     permission_classes = [permissions.AllowAny]
-    renderer_classes = [JSONRenderer]
+    renderer_classes = [FastJSONRenderer]
+    throttle_classes = [TokenThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         token = serializer.save()
         return Response({"token": token["access"]}, status=status.HTTP_200_OK)
+
+
+class ExportView(APIView):
+    """Класс для потоковой выгрузки таблиц в формате csv_load."""
+
+    permission_classes = (IsAdmin,)
+
+    def get(self, request, filename):
+        if filename not in EXPORT_FILES:
+            raise Http404
+        chunks = iter_csv(filename)
+        content_type = 'text/csv; charset=utf-8'
+        if request.query_params.get('gzip'):
+            chunks = gzip_stream(chunks)
+            content_type = 'application/gzip'
+            filename = f'{filename}.gz'
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="{filename}"'
+        )
+        return response
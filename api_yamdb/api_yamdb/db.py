@@ -0,0 +1,99 @@
+"""
+Настройки подключения к базе данных из переменных окружения.
+
+DB_ENGINE выбирает sqlite3 (по умолчанию) или postgresql. Соединения
+живут DB_CONN_MAX_AGE секунд и переиспользуются между запросами;
+DB_CONN_HEALTH_CHECKS проверяет такое соединение в начале запроса.
+DB_REPLICAS перечисляет через запятую реплики для чтения: файлы для
+SQLite или хосты для PostgreSQL.
+
+Django 3.2 не умеет пул соединений: для PostgreSQL его даёт внешний
+пулер (pgbouncer), к которому подключаются через DB_HOST и DB_PORT.
+"""
+import os
+
+from django.db import connections
+
+SQLITE_PRAGMAS = (
+    ('journal_mode', 'DB_SQLITE_JOURNAL_MODE', 'WAL'),
+    ('synchronous', 'DB_SQLITE_SYNCHRONOUS', 'NORMAL'),
+    ('mmap_size', 'DB_SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)),
+    ('busy_timeout', 'DB_SQLITE_BUSY_TIMEOUT', '5000'),
+)
+
+
+def get_flag(name, default):
+    return os.getenv(name, default).lower() in ('1', 'true', 'yes', 'on')
+
+
+def database_config(base_dir):
+    """Возвращает настройки базы `default`."""
+    engine = os.getenv('DB_ENGINE', 'sqlite3')
+    config = {
+        'ENGINE': f'django.db.backends.{engine}',
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': get_flag('DB_CONN_HEALTH_CHECKS', 'true'),
+    }
+    if engine == 'sqlite3':
+        config['NAME'] = os.getenv('DB_NAME', base_dir / 'db.sqlite3')
+        return config
+    config.update({
+        'NAME': os.getenv('DB_NAME', 'api_yamdb'),
+        'USER': os.getenv('DB_USER', 'postgres'),
+        'PASSWORD': os.getenv('DB_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', 'localhost'),
+        'PORT': os.getenv('DB_PORT', '5432'),
+    })
+    return config
+
+
+def replica_configs(primary):
+    """
+    Возвращает настройки реплик `replica_0`, `replica_1`, ...
+
+    Реплика отличается от основной базы только файлом или хостом.
+    В тестах реплики указывают на тестовую основную базу.
+    """
+    key = 'NAME' if primary['ENGINE'].endswith('sqlite3') else 'HOST'
+    replicas = filter(None, os.getenv('DB_REPLICAS', '').split(','))
+    return {
+        f'replica_{number}': {
+            **primary, key: value.strip(), 'TEST': {'MIRROR': 'default'},
+        }
+        for number, value in enumerate(replicas)
+    }
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Включает WAL, synchronous=NORMAL, mmap и ожидание блокировки.
+
+    Выполняется для каждого нового соединения с SQLite; с постоянными
+    соединениями это происходит один раз за время их жизни.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, variable, default in SQLITE_PRAGMAS:
+            cursor.execute(
+                f'PRAGMA {pragma} = {os.getenv(variable, default)}'
+            )
+
+
+def check_connections(**kwargs):
+    """
+    Закрывает неработоспособные постоянные соединения перед запросом.
+
+    Django до 4.1 проверяет соединение, только если в нём уже была
+    ошибка; соединение, разорванное сервером БД во время простоя,
+    иначе уронило бы первый запрос.
+    """
+    for connection in connections.all():
+        if (
+            connection.connection is not None
+            and connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            and connection.settings_dict['CONN_MAX_AGE'] != 0
+            and not connection.in_atomic_block
+            and not connection.is_usable()
+        ):
+            connection.close()
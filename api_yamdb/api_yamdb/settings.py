@@ -1,6 +1,9 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
+from api_yamdb.db import database_config, replica_configs
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
@@ -27,6 +30,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.routing.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -58,12 +62,35 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 
 DATABASES = {
+    'default': database_config(BASE_DIR),
+}
+
+DATABASES.update(replica_configs(DATABASES['default']))
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['api.routing.ReplicaRouter']
+
+# Сколько секунд после своей записи пользователь читает с основной базы.
+REPLICA_STICKY_SECONDS = 5
+
+
+# Версии ресурсов, ответы API и признак недавней записи должны быть
+# общими для всех процессов: в профиле production нужен общий кэш
+# (memcached, база данных или файлы), а не память процесса.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
 
+API_CACHE_ALIAS = 'default'
+
+API_CACHE_TIMEOUT = 60 * 5
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -103,8 +130,17 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
 
@@ -112,8 +148,23 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': '30/m',
+        'signup_username': '5/m',
+        'token_ip': '30/m',
+        'token_username': '10/m',
+    },
 }
 
+# Профиль production оставляет только JWT: Basic-аутентификация проверяет
+# хэш пароля на каждом запросе, а сессии API не нужны.
+API_AUTH_PROFILE = os.getenv('API_AUTH_PROFILE', 'development')
+
+if API_AUTH_PROFILE == 'production':
+    REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'] = (
+        'api.authentication.StatelessJWTAuthentication',
+    )
+
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
@@ -122,7 +173,45 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1)
 }
 
+TOKEN_VERSION_CACHE_TIMEOUT = 60
+
+# Под ASGI чтение каталога выполняется асинхронно в пуле потоков.
+API_ASYNC_READS = os.getenv('API_ASYNC_READS', 'false').lower() == 'true'
+
+API_ASYNC_READ_WORKERS = int(os.getenv('API_ASYNC_READ_WORKERS', '16'))
+
+# Списки и карточки произведений, отзывов и комментариев сериализуются
+# по строкам values_list, без экземпляров моделей и ModelSerializer.
+API_FAST_SERIALIZERS = (
+    os.getenv('API_FAST_SERIALIZERS', 'true').lower() == 'true'
+)
+
+# Хранилище корзин токенов для ограничения частоты запросов:
+# locmem — память процесса, cache — кэш API, общий для процессов.
+API_THROTTLE_STORE = os.getenv('API_THROTTLE_STORE', 'cache')
+
+CONFIRMATION_CODE_LIFETIME = timedelta(hours=24)
+
+CONFIRMATION_CODE_MAX_ATTEMPTS = 5
+
+AUTH_USER_CACHE_SIZE = 1024
+
+AUTH_USER_CACHE_TIMEOUT = 30
+
 AUTH_USER_MODEL = 'users.CinemaUser'
 
 
 EMAIL_FROM = 'yamdb@example.com'
+
+# sync — письмо отправляется в запросе, outbox — сохраняется в очередь,
+# которую разбирает команда send_outbox.
+EMAIL_DELIVERY = os.getenv(
+    'EMAIL_DELIVERY',
+    'outbox' if API_AUTH_PROFILE == 'production' else 'sync'
+)
+
+OUTBOX_BATCH_SIZE = 100
+
+OUTBOX_MAX_ATTEMPTS = 5
+
+OUTBOX_RETRY_DELAY = 30
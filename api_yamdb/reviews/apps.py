@@ -1,7 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save
 
 
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
     verbose_name = 'Reviews'
+
+    def ready(self):
+        from reviews.models import Review
+        from reviews.signals import (check_search_triggers,
+                                     update_rating_on_delete,
+                                     update_rating_on_save)
+
+        post_save.connect(update_rating_on_save, sender=Review)
+        post_delete.connect(update_rating_on_delete, sender=Review)
+        post_migrate.connect(check_search_triggers, sender=self)
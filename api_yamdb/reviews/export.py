@@ -0,0 +1,91 @@
+import csv
+import io
+import zlib
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+
+CHUNK_SIZE = 2000
+
+User = get_user_model()
+
+# Файл -> (модель, заголовок CSV, поля модели) в формате команды csv_load.
+EXPORT_FILES = {
+    'category.csv': (
+        Category, ('id', 'name', 'slug'), ('id', 'name', 'slug'),
+    ),
+    'genre.csv': (
+        Genre, ('id', 'name', 'slug'), ('id', 'name', 'slug'),
+    ),
+    'titles.csv': (
+        Title,
+        ('id', 'name', 'year', 'category'),
+        ('id', 'name', 'year', 'category_id'),
+    ),
+    'users.csv': (
+        User,
+        ('id', 'username', 'email', 'role', 'bio', 'first_name',
+         'last_name'),
+        ('id', 'username', 'email', 'role', 'bio', 'first_name',
+         'last_name'),
+    ),
+    'review.csv': (
+        Review,
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        ('id', 'title_id', 'text', 'author_id', 'score', 'pub_date'),
+    ),
+    'comments.csv': (
+        Comment,
+        ('id', 'review_id', 'text', 'author', 'pub_date'),
+        ('id', 'review_id', 'text', 'author_id', 'pub_date'),
+    ),
+    'genre_title.csv': (
+        GenreTitle,
+        ('id', 'title_id', 'genre_id'),
+        ('id', 'title_id', 'genre_id'),
+    ),
+}
+
+
+def format_value(value):
+    """Приводит значение к виду, принятому в исходных CSV-файлах."""
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat(
+            timespec='milliseconds'
+        ).replace('+00:00', 'Z')
+    return '' if value is None else value
+
+
+def iter_csv(filename, chunk_size=CHUNK_SIZE):
+    """
+    Построчно выгружает таблицу в CSV, отдавая байты пачками.
+
+    Строки читаются из БД серверным курсором через iterator(), поэтому
+    расход памяти не зависит от размера таблицы.
+    """
+    model, header, fields = EXPORT_FILES[filename]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(header)
+    rows = model.objects.order_by('pk').values_list(*fields).iterator(
+        chunk_size=chunk_size
+    )
+    for count, row in enumerate(rows, 1):
+        writer.writerow([format_value(value) for value in row])
+        if count % chunk_size == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def gzip_stream(chunks):
+    """Сжимает поток байтов в формат gzip на лету."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,44 @@
+import os
+import time
+
+from django.core.management import BaseCommand
+
+from reviews.export import CHUNK_SIZE, EXPORT_FILES, gzip_stream, iter_csv
+
+
+class Command(BaseCommand):
+    help = "Dump DB to CSV files in the csv_load format"
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir', help='Каталог для CSV-файлов')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество строк, читаемых из БД за раз',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать файлы в формат gzip',
+        )
+
+    def handle(self, *args, **options):
+        os.makedirs(options['output_dir'], exist_ok=True)
+        for filename in EXPORT_FILES:
+            started = time.monotonic()
+            chunks = iter_csv(filename, options['chunk_size'])
+            if options['gzip']:
+                chunks = gzip_stream(chunks)
+                filename = f'{filename}.gz'
+            path = os.path.join(options['output_dir'], filename)
+            size = 0
+            with open(path, 'wb') as file:
+                for chunk in chunks:
+                    file.write(chunk)
+                    size += len(chunk)
+            self.stdout.write(
+                f"{filename}: {size} байт за "
+                f"{time.monotonic() - started:.2f} с"
+            )
+        self.stdout.write("!!!База данных выгружена успешно!!!")
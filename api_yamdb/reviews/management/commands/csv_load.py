@@ -1,52 +1,189 @@
 import csv
+import io
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.management import BaseCommand
+from django.db import connection, transaction
 
 from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.signals import catalogue_changed
 
 DATA_DIR = os.path.join(settings.BASE_DIR, "static/data/")
+BATCH_SIZE = 1000
+CHUNK_ROWS = 10000
 
 User = get_user_model()
 
 
-def create_object(filename, func):
-    with open(os.path.join(DATA_DIR, filename), 'r', encoding='utf-8') as file:
-        reader = csv.reader(file)
-        next(reader)
-        for row in reader:
-            func(row)
+class KnownIds(dict):
+    """Множества id уже загруженных объектов, читаемые из БД по запросу."""
 
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
 
-def category_create(row):
-    Category.objects.get_or_create(
+    def __missing__(self, model):
+        with self.lock:
+            ids = self.get(model)
+            if ids is None:
+                ids = set(model.objects.values_list('pk', flat=True))
+                self[model] = ids
+        return ids
+
+
+def read_width(path):
+    """Количество колонок по заголовку файла."""
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        return len(next(csv.reader(file)))
+
+
+def split_file(path, chunk_rows):
+    """
+    Делит CSV-файл после заголовка на диапазоны байт по `chunk_rows` записей.
+
+    Граница записи — перевод строки вне кавычек: до него чётное число
+    кавычек, так как кавычка внутри значения удваивается. Файл здесь
+    не разбирается, а только просматривается построчно, поэтому память
+    не зависит от его размера. Возвращает начало и конец диапазона и
+    номер его первой строки в файле.
+    """
+    start = offset = line = records = 0
+    first_line = None
+    odd_quotes = False
+    with open(path, 'rb') as file:
+        for raw in file:
+            offset += len(raw)
+            line += 1
+            odd_quotes ^= bool(raw.count(b'"') % 2)
+            if odd_quotes:
+                continue
+            if first_line is None:
+                start, first_line = offset, line + 1
+                continue
+            records += 1
+            if records == chunk_rows:
+                yield start, offset, first_line
+                start, first_line, records = offset, line + 1, 0
+    if records:
+        yield start, offset, first_line
+
+
+def parse_chunk(path, start, end, first_line, width, int_columns,
+                nullable_columns=()):
+    """
+    Читает и проверяет диапазон CSV-файла; выполняется в отдельном процессе.
+
+    Возвращает корректные строки и номера отброшенных строк: с неверным
+    количеством колонок или с нечисловыми id. Пустое значение в колонке
+    из `nullable_columns` — это NULL, как его выгружает csv_dump.
+    """
+    with open(path, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start).decode('utf-8')
+    rows, invalid = [], []
+    reader = csv.reader(io.StringIO(data, newline=''))
+    for row in reader:
+        try:
+            if len(row) != width:
+                raise ValueError
+            for column in int_columns:
+                if row[column] == '' and column in nullable_columns:
+                    row[column] = None
+                else:
+                    row[column] = int(row[column])
+        except ValueError:
+            invalid.append(first_line + reader.line_num - 1)
+            continue
+        rows.append(row)
+    return rows, invalid
+
+
+def build_levels(models):
+    """
+    Раскладывает модели по уровням графа зависимостей по внешним ключам.
+
+    Модели одного уровня не ссылаются друг на друга и могут загружаться
+    одновременно; каждый уровень зависит только от предыдущих.
+    """
+    deps = {
+        model: {
+            field.related_model for field in model._meta.concrete_fields
+            if field.is_relation
+            and field.related_model in models
+            and field.related_model is not model
+        }
+        for model in models
+    }
+    levels = []
+    while deps:
+        level = [model for model, parents in deps.items() if not parents]
+        if not level:
+            raise ValueError('Циклическая зависимость между моделями')
+        levels.append(level)
+        for model in level:
+            del deps[model]
+        for parents in deps.values():
+            parents.difference_update(level)
+    return levels
+
+
+def create_object(model, rows, func, known, batch_size):
+    """
+    Загружает строки пачками через bulk_create.
+
+    Возвращает количество пропущенных строк. Строки, уже присутствующие
+    в БД, пропускаются за счёт ignore_conflicts.
+    """
+    rows = iter(rows)
+    skipped = 0
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+        objs = [func(row, known) for row in chunk]
+        skipped += objs.count(None)
+        model.objects.bulk_create(
+            [obj for obj in objs if obj is not None],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+    return skipped
+
+
+def category_create(row, known):
+    return Category(
         id=row[0],
         name=row[1],
         slug=row[2],
     )
 
 
-def genre_create(row):
-    Genre.objects.get_or_create(
+def genre_create(row, known):
+    return Genre(
         id=row[0],
         name=row[1],
         slug=row[2],
     )
 
 
-def titles_create(row):
-    Title.objects.get_or_create(
+def titles_create(row, known):
+    return Title(
         id=row[0],
         name=row[1],
         year=row[2],
-        category_id=row[3],
+        category_id=row[3] if row[3] in known[Category] else None,
     )
 
 
-def users_create(row):
-    User.objects.get_or_create(
+def users_create(row, known):
+    return User(
         id=row[0],
         username=row[1],
         email=row[2],
@@ -57,11 +194,12 @@ def users_create(row):
     )
 
 
-def review_create(row):
-    title, _ = Title.objects.get_or_create(id=row[1])
-    Review.objects.get_or_create(
+def review_create(row, known):
+    if row[1] not in known[Title] or row[3] not in known[User]:
+        return None
+    return Review(
         id=row[0],
-        title=title,
+        title_id=row[1],
         text=row[2],
         author_id=row[3],
         score=row[4],
@@ -69,42 +207,144 @@ def review_create(row):
     )
 
 
-def comment_create(row):
-    review, _ = Review.objects.get_or_create(id=row[1])
-    Comment.objects.get_or_create(
+def comment_create(row, known):
+    if row[1] not in known[Review] or row[3] not in known[User]:
+        return None
+    return Comment(
         id=row[0],
-        review=review,
+        review_id=row[1],
         text=row[2],
         author_id=row[3],
         pub_date=row[4],
     )
 
 
-def genre_title_create(row):
-    title, _ = Title.objects.get_or_create(id=row[1])
-    genre, _ = Genre.objects.get_or_create(id=row[2])
-    GenreTitle.objects.get_or_create(
+def genre_title_create(row, known):
+    if row[1] not in known[Title] or row[2] not in known[Genre]:
+        return None
+    return GenreTitle(
         id=row[0],
-        title=title,
-        genre=genre,
+        title_id=row[1],
+        genre_id=row[2],
     )
 
 
+# Файл: модель, функция создания объекта, числовые колонки и те из них,
+# что могут быть пустыми (внешние ключи с null=True).
 action = {
-    'category.csv': category_create,
-    'genre.csv': genre_create,
-    'titles.csv': titles_create,
-    'users.csv': users_create,
-    'review.csv': review_create,
-    'comments.csv': comment_create,
-    'genre_title.csv': genre_title_create
+    'category.csv': (Category, category_create, (0,), ()),
+    'genre.csv': (Genre, genre_create, (0,), ()),
+    'titles.csv': (Title, titles_create, (0, 2, 3), (3,)),
+    'users.csv': (User, users_create, (0,), ()),
+    'review.csv': (Review, review_create, (0, 1, 3, 4), ()),
+    'comments.csv': (Comment, comment_create, (0, 1, 3), ()),
+    'genre_title.csv': (GenreTitle, genre_title_create, (0, 1, 2), (1, 2)),
 }
 
 
 class Command(BaseCommand):
     help = "Load test DB from dir ({})".format(DATA_DIR)
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество строк в одном INSERT',
+        )
+        parser.add_argument(
+            '--data-dir',
+            default=DATA_DIR,
+            help='Каталог с CSV-файлами',
+        )
+        parser.add_argument(
+            '--chunk-rows',
+            type=int,
+            default=CHUNK_ROWS,
+            help='Количество записей в одном куске для разбора',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Количество процессов для разбора CSV',
+        )
+
+    def iter_chunks(self, pool, filename, options):
+        """
+        Разобранные куски файла по порядку.
+
+        В работе одновременно не больше двух кусков на процесс: следующие
+        отправляются на разбор по мере загрузки предыдущих, поэтому
+        память не растёт с размером файла.
+        """
+        path = os.path.join(options['data_dir'], filename)
+        width = read_width(path)
+        *_, int_columns, nullable_columns = action[filename]
+        pending = deque()
+        for bounds in split_file(path, options['chunk_rows']):
+            pending.append(pool.submit(
+                parse_chunk, path, *bounds, width, int_columns,
+                nullable_columns,
+            ))
+            if len(pending) >= 2 * options['workers']:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def load_file(self, pool, filename, known, options):
+        """Загружает файл в одной транзакции по мере разбора кусков."""
+        model, func, *_ = action[filename]
+        started = time.monotonic()
+        total = skipped = invalid = 0
+        with transaction.atomic():
+            for rows, errors in self.iter_chunks(pool, filename, options):
+                total += len(rows)
+                invalid += len(errors)
+                skipped += create_object(
+                    model, rows, func, known, options['batch_size']
+                )
+        elapsed = time.monotonic() - started
+        return (
+            f"{filename}: {total} строк за {elapsed:.2f} с "
+            f"({total / elapsed if elapsed else total:.0f} строк/с), "
+            f"пропущено: {skipped}, с ошибками: {invalid}"
+        )
+
+    def load_file_in_thread(self, *args):
+        try:
+            return self.load_file(*args)
+        finally:
+            connection.close()
+
     def handle(self, *args, **options):
-        for filename, func in action.items():
-            create_object(filename, func)
+        """
+        Загружает файлы по уровням зависимостей, разбирая их в процессах.
+
+        Каждый файл делится на куски по `--chunk-rows` записей, которые
+        разбираются параллельно во всех процессах. Файлы одного уровня
+        загружаются в потоках с отдельными соединениями; на SQLite, где
+        запись в базу последовательная, — по очереди.
+        """
+        files = {model: filename for filename, (model, *_) in action.items()}
+        options['workers'] = max(options['workers'] or 1, 1)
+        concurrent = options['workers'] > 1 and connection.vendor != 'sqlite'
+        known = KnownIds()
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            for level in build_levels(list(files)):
+                jobs = [
+                    (pool, files[model], known, options) for model in level
+                ]
+                if concurrent:
+                    with ThreadPoolExecutor(max_workers=len(jobs)) as threads:
+                        reports = list(threads.map(
+                            lambda job: self.load_file_in_thread(*job), jobs
+                        ))
+                else:
+                    reports = [self.load_file(*job) for job in jobs]
+                for model in level:
+                    known.pop(model, None)
+                self.stdout.write("\n".join(reports))
+        Title.objects.all().rebuild_ratings()
+        catalogue_changed.send(sender=self.__class__)
         self.stdout.write("!!!База данных загружена успешно!!!")
@@ -0,0 +1,13 @@
+from django.core.management import BaseCommand
+
+from reviews.models import Title
+from reviews.signals import catalogue_changed
+
+
+class Command(BaseCommand):
+    help = "Rebuild stored title ratings from reviews"
+
+    def handle(self, *args, **options):
+        updated = Title.objects.all().rebuild_ratings()
+        catalogue_changed.send(sender=self.__class__)
+        self.stdout.write(f"Рейтинг пересчитан для {updated} произведений")
@@ -0,0 +1,93 @@
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE reviews_title_fts USING fts5(
+        name, description,
+        content='reviews_title', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_insert AFTER INSERT ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_delete AFTER DELETE ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(
+            reviews_title_fts, rowid, name, description
+        )
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER reviews_title_fts_update
+    AFTER UPDATE OF name, description ON reviews_title
+    BEGIN
+        INSERT INTO reviews_title_fts(
+            reviews_title_fts, rowid, name, description
+        )
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO reviews_title_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO reviews_title_fts(reviews_title_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS reviews_title_fts_update',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_delete',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_insert',
+    'DROP TABLE IF EXISTS reviews_title_fts',
+]
+
+POSTGRESQL_FORWARD = [
+    """
+    ALTER TABLE reviews_title ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('russian', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX reviews_title_search_idx ON reviews_title
+    USING GIN (search_vector)
+    """,
+]
+
+POSTGRESQL_BACKWARD = [
+    'DROP INDEX IF EXISTS reviews_title_search_idx',
+    'ALTER TABLE reviews_title DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def run_statements(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_statements({
+                'sqlite': SQLITE_FORWARD,
+                'postgresql': POSTGRESQL_FORWARD,
+            }),
+            run_statements({
+                'sqlite': SQLITE_BACKWARD,
+                'postgresql': POSTGRESQL_BACKWARD,
+            }),
+        ),
+    ]
@@ -1,7 +1,13 @@
+import re
+
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.db.models import Avg
+from django.db import connections, models
+from django.db.models import (Avg, BooleanField, Case, Count,
+                              ExpressionWrapper, F, FloatField, OuterRef, Q,
+                              Subquery, Sum, Value, When)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce
 from django.urls import reverse
 
 from .constants import MAX_SCORE, MIN_SCORE, NAME_LENGTH, TEXT_LENGTH
@@ -41,6 +47,88 @@ class Genre(CategoryGenreAbstract):
         verbose_name_plural = 'Жанры'
 
 
+class TitleQuerySet(models.QuerySet):
+    """Набор запросов произведений с хранимым рейтингом и поиском."""
+
+    def search(self, query):
+        """
+        Полнотекстовый поиск по названию и описанию.
+
+        Использует индекс FTS5 на SQLite и tsvector с GIN-индексом на
+        PostgreSQL; на прочих СУБД откатывается к поиску подстроки.
+        Добавляет аннотацию `search_rank`: чем больше, тем релевантнее.
+        """
+        vendor = connections[self.db].vendor
+        if vendor == 'sqlite':
+            terms = re.findall(r'\w+', query)
+            if not terms:
+                return self.none().annotate(
+                    search_rank=Value(0.0, output_field=FloatField())
+                )
+            match = ' '.join(f'"{term}"*' for term in terms)
+            return self.filter(pk__in=RawSQL(
+                'SELECT rowid FROM reviews_title_fts '
+                'WHERE reviews_title_fts MATCH %s', (match,)
+            )).annotate(search_rank=RawSQL(
+                'SELECT -bm25(reviews_title_fts, 10.0, 1.0) '
+                'FROM reviews_title_fts WHERE reviews_title_fts MATCH %s '
+                'AND rowid = reviews_title.id', (match,),
+                output_field=FloatField(),
+            ))
+        if vendor == 'postgresql':
+            tsquery = "websearch_to_tsquery('russian', %s)"
+            return self.filter(ExpressionWrapper(
+                RawSQL(f'reviews_title.search_vector @@ {tsquery}', (query,)),
+                output_field=BooleanField(),
+            )).annotate(search_rank=RawSQL(
+                f'ts_rank(reviews_title.search_vector, {tsquery})', (query,),
+                output_field=FloatField(),
+            ))
+        return self.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    def shift_rating(self, score_delta, count_delta):
+        """
+        Инкрементально сдвигает сумму и количество оценок.
+
+        Средний рейтинг пересчитывается в том же UPDATE из старых значений,
+        поэтому параллельные изменения отзывов не теряются.
+        """
+        new_sum = F('rating_sum') + score_delta
+        new_count = F('rating_count') + count_delta
+        return self.update(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            rating=Case(
+                When(rating_count__lte=-count_delta, then=Value(None)),
+                default=Cast(new_sum, FloatField()) / new_count,
+                output_field=FloatField(),
+            ),
+        )
+
+    def rebuild_ratings(self):
+        """Пересчитывает рейтинг произведений по всем отзывам с нуля."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        return self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0,
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('id')).values('total')),
+                0,
+            ),
+            rating=Subquery(
+                reviews.annotate(
+                    avg=Avg('score', output_field=FloatField())
+                ).values('avg')
+            ),
+        )
+
+
 class Title(models.Model):
     """Произведения."""
 
@@ -60,11 +148,19 @@ class Title(models.Model):
         on_delete=models.SET_NULL,
         null=True,
     )
+    rating_sum = models.PositiveIntegerField('Сумма оценок', default=0)
+    rating_count = models.PositiveIntegerField('Количество оценок', default=0)
+    rating = models.FloatField('Рейтинг', null=True, blank=True)
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         ordering = ('name',)
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['-rating', 'name'], name='title_rating_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -73,7 +169,7 @@ class Title(models.Model):
         return reverse('title_detail', args=[str(self.id)])
 
     def get_average_score(self):
-        return self.reviews.aggregate(Avg('score'))['score__avg']
+        return self.rating
 
 
 class GenreTitle(models.Model):
@@ -154,6 +250,26 @@ class Review(PubDate, models.Model):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Запоминает оценку и произведение из БД.
+
+        По ним сигналы сдвигают рейтинг при изменении оценки и переносе
+        отзыва к другому произведению.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded()
+        return instance
+
+    def remember_loaded(self):
+        self._loaded_score = self.__dict__.get('score')
+        self._loaded_title_id = self.__dict__.get('title_id')
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.remember_loaded()
+
 
 class Comment(PubDate, models.Model):
     """Модель комментария."""
@@ -0,0 +1,67 @@
+from django.db import connections
+
+# Триггеры синхронизации индекса FTS5 с reviews_title на SQLite.
+# Повторяют миграцию 0007_title_search: схема SQLite пересоздаёт
+# таблицу при многих AlterField и RemoveField, и триггеры пропадают.
+SQLITE_TRIGGERS = {
+    'reviews_title_fts_insert': """
+        CREATE TRIGGER IF NOT EXISTS reviews_title_fts_insert
+        AFTER INSERT ON reviews_title
+        BEGIN
+            INSERT INTO reviews_title_fts(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    """,
+    'reviews_title_fts_delete': """
+        CREATE TRIGGER IF NOT EXISTS reviews_title_fts_delete
+        AFTER DELETE ON reviews_title
+        BEGIN
+            INSERT INTO reviews_title_fts(
+                reviews_title_fts, rowid, name, description
+            )
+            VALUES ('delete', old.id, old.name, old.description);
+        END
+    """,
+    'reviews_title_fts_update': """
+        CREATE TRIGGER IF NOT EXISTS reviews_title_fts_update
+        AFTER UPDATE OF name, description ON reviews_title
+        BEGIN
+            INSERT INTO reviews_title_fts(
+                reviews_title_fts, rowid, name, description
+            )
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO reviews_title_fts(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    """,
+}
+
+REBUILD_INDEX = (
+    "INSERT INTO reviews_title_fts(reviews_title_fts) VALUES ('rebuild')"
+)
+
+
+def restore_search_triggers(using='default'):
+    """
+    Восстанавливает пропавшие триггеры индекса поиска на SQLite.
+
+    Если триггеров не было, индекс мог отстать от таблицы, поэтому он
+    перестраивается. Возвращает имена восстановленных триггеров.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE name = 'reviews_title_fts' OR tbl_name = 'reviews_title'"
+        )
+        existing = {name for name, in cursor.fetchall()}
+        if 'reviews_title_fts' not in existing:
+            return []
+        missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            cursor.execute(REBUILD_INDEX)
+    return missing
@@ -0,0 +1,55 @@
+from django.dispatch import Signal
+
+from reviews.models import Title
+from reviews.search import restore_search_triggers
+
+# Массовое изменение каталога в обход сигналов моделей: bulk_create,
+# QuerySet.update(). Отправитель — команда или приложение с изменением.
+catalogue_changed = Signal()
+
+
+def update_rating_on_save(sender, instance, created, raw, **kwargs):
+    """
+    Сдвигает рейтинг произведения при создании и изменении отзыва.
+
+    При переносе отзыва оценка вычитается из прежнего произведения
+    и добавляется к новому. Для изменения нужны оценка и произведение,
+    прочитанные из БД; если они неизвестны (отзыв создан не из выборки
+    или загружен не полностью), рейтинг пересчитывается с нуля.
+    """
+    titles = Title.objects.filter(pk=instance.title_id)
+    loaded_score = getattr(instance, '_loaded_score', None)
+    loaded_title_id = getattr(instance, '_loaded_title_id', None)
+    if created and not raw:
+        titles.shift_rating(instance.score, 1)
+    elif raw or loaded_score is None or loaded_title_id is None:
+        Title.objects.filter(
+            pk__in={instance.title_id, loaded_title_id} - {None}
+        ).rebuild_ratings()
+    elif loaded_title_id != instance.title_id:
+        Title.objects.filter(pk=loaded_title_id).shift_rating(
+            -loaded_score, -1
+        )
+        titles.shift_rating(instance.score, 1)
+    elif loaded_score != instance.score:
+        titles.shift_rating(instance.score - loaded_score, 0)
+
+
+def update_rating_on_delete(sender, instance, **kwargs):
+    """
+    Убирает оценку удалённого отзыва из рейтинга произведения.
+
+    Срабатывает и при каскадном удалении: вместе с пользователем,
+    из админки или через QuerySet.delete().
+    """
+    titles = Title.objects.filter(pk=instance.title_id)
+    if 'score' in instance.get_deferred_fields():
+        titles.rebuild_ratings()
+    else:
+        titles.shift_rating(-instance.score, -1)
+
+
+def check_search_triggers(sender, using, **kwargs):
+    """После миграций возвращает триггеры поиска, удалённые схемой."""
+    if restore_search_triggers(using):
+        catalogue_changed.send(sender=sender)
@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin
 
+from users.models import OutgoingEmail
+
 User = get_user_model()
 
 
@@ -18,3 +20,10 @@ class CustomUserAdmin(UserAdmin):
             'bio',
             'role')}),
     )
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'subject', 'created', 'attempts', 'sent_at')
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
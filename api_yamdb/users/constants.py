@@ -2,3 +2,4 @@ CONST_ROLE_LENGTH = 20
 CONST_EMAIL_LENGTH = 254
 CONST_CONFIRMATION_LENGTH = 6
 CONST_USERNAME_LENGTH = 150
+CONST_SUBJECT_LENGTH = 255
@@ -0,0 +1,48 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from users.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = "Send queued emails from the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.OUTBOX_BATCH_SIZE,
+            help='Количество писем, отправляемых за одно соединение',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза в секундах, когда очередь пуста',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Разобрать очередь один раз и завершиться',
+        )
+
+    def handle(self, *args, **options):
+        """
+        Разбирает очередь писем пачками.
+
+        Полные пачки отправляются подряд; когда очередь пуста, обработчик
+        ждёт `--interval` секунд, а с `--once` — завершается.
+        """
+        while True:
+            sent, failed = deliver_pending(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(
+                    f"Отправлено: {sent}, отложено: {failed}"
+                )
+            if sent + failed == options['batch_size']:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cinemauser',
+            name='confirmation_code_issued',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Время выдачи кода подтверждения'),
+        ),
+        migrations.AddField(
+            model_name='cinemauser',
+            name='confirmation_attempts',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Неудачные попытки ввода кода'),
+        ),
+    ]
@@ -1,12 +1,15 @@
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from users.constants import (
     CONST_EMAIL_LENGTH,
     CONST_ROLE_LENGTH,
     CONST_CONFIRMATION_LENGTH,
+    CONST_SUBJECT_LENGTH,
     CONST_USERNAME_LENGTH,
 )
 from users.roles import Roles
@@ -16,6 +19,9 @@ from users.validators import validate_username_me
 class CinemaUser(AbstractUser):
     """Определяет модель пользователя."""
 
+    # Поля, от которых зависят права: их изменение отзывает токены.
+    ACCESS_FIELDS = ('role', 'is_staff', 'is_active')
+
     email = models.EmailField(
         _('email address'),
         max_length=CONST_EMAIL_LENGTH,
@@ -43,6 +49,18 @@ class CinemaUser(AbstractUser):
         blank=True,
         default=''
     )
+    confirmation_code_issued = models.DateTimeField(
+        'Время выдачи кода подтверждения',
+        default=timezone.now
+    )
+    confirmation_attempts = models.PositiveSmallIntegerField(
+        'Неудачные попытки ввода кода',
+        default=0
+    )
+    token_version = models.PositiveIntegerField(
+        'Версия токенов',
+        default=0
+    )
 
     class Meta:
         verbose_name = 'Пользователь'
@@ -53,6 +71,51 @@ class CinemaUser(AbstractUser):
         """Метод, который возвращает строковое представление объекта."""
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._loaded_access = user.get_access()
+        user._loaded_username = user.__dict__.get('username')
+        return user
+
+    @property
+    def username_changed(self):
+        """Изменилось ли имя, прочитанное из БД: оно есть в ответах API."""
+        loaded = getattr(self, '_loaded_username', None)
+        return loaded is not None and loaded != self.username
+
+    def get_access(self):
+        """Загруженные значения полей, от которых зависят права."""
+        return {
+            field: self.__dict__[field]
+            for field in self.ACCESS_FIELDS
+            if field in self.__dict__
+        }
+
+    def save(self, *args, **kwargs):
+        """
+        Увеличивает версию токенов, если изменились права пользователя.
+
+        Срабатывает при любом сохранении через ORM: из API, админки,
+        консоли и команд. Версия увеличивается в БД, поэтому
+        устаревшее значение в экземпляре не откатывает её назад.
+        """
+        loaded = getattr(self, '_loaded_access', {})
+        revoked = any(
+            self.__dict__.get(field, value) != value
+            for field, value in loaded.items()
+        )
+        if revoked:
+            self.token_version = F('token_version') + 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        if revoked:
+            self.refresh_from_db(fields=('token_version',))
+        self._loaded_access = self.get_access()
+        self._loaded_username = self.__dict__.get('username')
+
     @property
     def is_admin(self):
         """Свойство, которое проверяет, является ли пользователь админом."""
@@ -64,3 +127,36 @@ class CinemaUser(AbstractUser):
         Свойство, которое проверяет, является ли пользователь модератором.
         """
         return self.role == Roles.MODERATOR.value
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку фоновым обработчиком."""
+
+    recipient = models.EmailField(
+        'Получатель',
+        max_length=CONST_EMAIL_LENGTH
+    )
+    subject = models.CharField('Тема', max_length=CONST_SUBJECT_LENGTH)
+    body = models.TextField('Текст')
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now
+    )
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=['sent_at', 'next_attempt_at'],
+                name='outgoing_email_due_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+
+def enqueue_email(recipient, subject, body):
+    """Сохраняет письмо в очередь; отправит его команда send_outbox."""
+    return OutgoingEmail.objects.create(
+        recipient=recipient, subject=subject, body=body
+    )
+
+
+def get_retry_time(attempts, now):
+    """Время следующей попытки с экспоненциально растущей паузой."""
+    return now + timedelta(
+        seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def get_due_emails(now, batch_size):
+    """
+    Выбирает и блокирует письма, которые пора отправить.
+
+    Заблокированные другим обработчиком строки пропускаются, поэтому
+    несколько обработчиков не отправят одно письмо дважды.
+    """
+    queryset = OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=settings.OUTBOX_MAX_ATTEMPTS,
+        next_attempt_at__lte=now,
+    ).order_by('next_attempt_at', 'pk')
+    if connection.features.has_select_for_update_skip_locked:
+        queryset = queryset.select_for_update(skip_locked=True)
+    return list(queryset[:batch_size])
+
+
+def postpone(email, error, now):
+    """Откладывает письмо после неудачной попытки отправки."""
+    email.attempts += 1
+    email.last_error = repr(error)
+    email.next_attempt_at = get_retry_time(email.attempts, now)
+
+
+def send_batch(mail_connection, emails, now):
+    """Отправляет письма через открытое соединение по одному."""
+    sent, failed = [], []
+    for email in emails:
+        message = EmailMessage(
+            email.subject,
+            email.body,
+            settings.EMAIL_FROM,
+            [email.recipient],
+            connection=mail_connection,
+        )
+        try:
+            message.send()
+        except Exception as error:
+            postpone(email, error, now)
+            failed.append(email)
+        else:
+            email.attempts += 1
+            email.sent_at = timezone.now()
+            sent.append(email)
+    return sent, failed
+
+
+def deliver_pending(batch_size=None):
+    """
+    Отправляет одну пачку писем через одно SMTP-соединение.
+
+    Неудачная отправка откладывает письмо с увеличением паузы; после
+    OUTBOX_MAX_ATTEMPTS попыток письмо больше не выбирается. Если
+    соединение не открылось, откладывается вся пачка, а обработчик
+    продолжает работу.
+    Возвращает количество отправленных и отложенных писем.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = get_due_emails(now, batch_size or settings.OUTBOX_BATCH_SIZE)
+        if not emails:
+            return 0, 0
+        mail_connection = get_connection(fail_silently=False)
+        try:
+            mail_connection.open()
+        except Exception as error:
+            for email in emails:
+                postpone(email, error, now)
+            sent, failed = [], emails
+        else:
+            with mail_connection:
+                sent, failed = send_batch(mail_connection, emails, now)
+        OutgoingEmail.objects.bulk_update(
+            sent + failed,
+            ('attempts', 'sent_at', 'last_error', 'next_attempt_at'),
+        )
+    return len(sent), len(failed)
@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+from django.core.cache import caches
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +35,14 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from api.authentication import user_cache
+    from api.throttling import BUCKET_STORES
+
+    for cache in caches.all():
+        cache.clear()
+    user_cache.clear()
+    BUCKET_STORES['locmem'].clear()
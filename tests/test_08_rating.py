@@ -0,0 +1,133 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_reviews(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+
+        review = create_single_review(admin_client, title_id, 'Хорошо', 4)
+        create_single_review(user_client, title_id, 'Отлично', 8)
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения обновляется при создании '
+            'отзыва.'
+        )
+
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review.json()['id']
+        )
+        admin_client.patch(review_url, data={'score': 10})
+        assert self.get_rating(admin_client, title_id) == 9, (
+            'Проверьте, что рейтинг произведения обновляется при изменении '
+            'оценки отзыва.'
+        )
+
+        admin_client.delete(review_url)
+        assert self.get_rating(admin_client, title_id) == 8, (
+            'Проверьте, что рейтинг произведения обновляется при удалении '
+            'отзыва.'
+        )
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (8, 1)
+
+    def test_02_rebuild_ratings_command(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Хорошо', 3)
+        create_single_review(user_client, title_id, 'Отлично', 6)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+
+        call_command('rebuild_ratings')
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            9, 2, 4.5
+        ), 'Проверьте, что команда `rebuild_ratings` пересчитывает рейтинг.'
+        assert Title.objects.get(pk=titles[1]['id']).rating is None
+
+    def test_03_duplicate_review_keeps_rating(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Хорошо', 4)
+        response = admin_client.post(
+            f'/api/v1/titles/{title_id}/reviews/',
+            data={'text': 'Ещё раз', 'score': 10}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставляли отзыв на это произведение']
+        }, 'Проверьте, что повторный отзыв отклоняется с понятной ошибкой.'
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (4, 1)
+
+    def test_04_cascade_delete_updates_rating(self, admin_client, user,
+                                              user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Хорошо', 4)
+        create_single_review(user_client, title_id, 'Отлично', 8)
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            4, 1, 4
+        ), (
+            'Проверьте, что рейтинг пересчитывается, когда отзывы удаляются '
+            'вместе с пользователем.'
+        )
+
+        Review.objects.filter(title_id=title_id).delete()
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            0, 0, None
+        ), 'Проверьте, что рейтинг сбрасывается при удалении всех отзывов.'
+
+    def test_05_orm_update_updates_rating(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Хорошо', 4)
+        review = Review.objects.get(title_id=title_id)
+        review.score = 7
+        review.save()
+        assert Title.objects.get(pk=title_id).rating == 7, (
+            'Проверьте, что рейтинг обновляется при изменении оценки вне API.'
+        )
+
+    def test_06_moved_review_updates_both_ratings(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        source, target = (title['id'] for title in titles[:2])
+        create_single_review(admin_client, source, 'Хорошо', 8)
+        review = Review.objects.get(title_id=source)
+        review.title_id = target
+        review.save()
+        expected = {source: (0, 0, None), target: (8, 1, 8)}
+        for title_id, ratings in expected.items():
+            title = Title.objects.get(pk=title_id)
+            assert (
+                title.rating_sum, title.rating_count, title.rating
+            ) == ratings, (
+                'Проверьте, что перенос отзыва к другому произведению '
+                'обновляет рейтинг обоих произведений.'
+            )
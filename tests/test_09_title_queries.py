@@ -0,0 +1,45 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    # COUNT для пагинации, страница произведений с категориями, жанры.
+    TITLES_LIST_QUERIES = 3
+
+    def create_titles(self, count, genres_per_title):
+        genres = [
+            Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(genres_per_title)
+        ]
+        for idx in range(count):
+            category = Category.objects.create(
+                name=f'Категория {idx}', slug=f'category-{idx}'
+            )
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category
+            )
+            title.genre.set(genres)
+
+    @pytest.mark.parametrize('count,genres_per_title', [
+        (1, 1), (10, 3), (50, 5),
+    ])
+    def test_01_title_list_query_budget(self, client,
+                                        django_assert_num_queries,
+                                        count, genres_per_title):
+        self.create_titles(count, genres_per_title)
+        with django_assert_num_queries(self.TITLES_LIST_QUERIES):
+            response = client.get(self.TITLES_URL, {'limit': count})
+        results = response.json()['results']
+        assert len(results) == count
+        assert all(
+            len(title['genre']) == genres_per_title
+            and title['category'] is not None
+            for title in results
+        ), (
+            f'Проверьте, что ответ на GET-запрос к `{self.TITLES_URL}` '
+            'содержит категорию и все жанры произведений.'
+        )
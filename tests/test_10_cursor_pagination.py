@@ -0,0 +1,101 @@
+import json
+from base64 import b64encode
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def walk(self, client, url, params):
+        """Проходит все страницы вперёд, затем обратно по `previous`."""
+        pages = []
+        response = client.get(url, {**params, 'cursor': ''})
+        while True:
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data
+            pages.append([obj['id'] for obj in data['results']])
+            if not data['next']:
+                break
+            response = client.get(data['next'])
+        backward = []
+        while data['previous']:
+            data = client.get(data['previous']).json()
+            backward.append([obj['id'] for obj in data['results']])
+        return pages, backward
+
+    def test_01_titles_cursor_matches_offset_order(self, client):
+        ratings = [None, 7.5, 3.0, 7.5, None, 10.0, 3.0]
+        for idx, rating in enumerate(ratings):
+            Title.objects.create(
+                name=f'Произведение {idx % 3}', year=2000, rating=rating
+            )
+        expected = [
+            title['id'] for title in client.get(
+                self.TITLES_URL, {'limit': len(ratings)}
+            ).json()['results']
+        ]
+
+        pages, backward = self.walk(client, self.TITLES_URL, {'limit': 2})
+        assert [pk for page in pages for pk in page] == expected, (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` отдаёт '
+            'произведения в том же порядке, что и пагинация limit/offset.'
+        )
+        assert backward == pages[-2::-1]
+
+    def test_02_reviews_cursor_without_count(self, client, admin):
+        title = Title.objects.create(name='Произведение', year=2000)
+        for score in range(1, 6):
+            author = type(admin).objects.create(
+                username=f'user{score}', email=f'user{score}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=score
+            )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        expected = list(
+            title.reviews.order_by('-pub_date', '-pk').values_list(
+                'pk', flat=True
+            )
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            pages, _ = self.walk(client, url, {'limit': 2})
+        assert [pk for page in pages for pk in page] == expected
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ), 'В режиме курсора не должен выполняться запрос COUNT(*).'
+
+        data = client.get(url, {'cursor': '', 'with_count': 1}).json()
+        assert data['count'] == len(expected)
+
+    def test_03_invalid_cursor(self, client):
+        response = client.get(self.TITLES_URL, {'cursor': 'broken'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize('position', [
+        ['abc', 'x', 1], [{'a': 1}, 'x', 1], [5, 'x', 'abc'],
+    ])
+    def test_04_cursor_with_bad_values(self, client, position):
+        title = Title.objects.create(name='Произведение', year=2000)
+        cursor = b64encode(
+            json.dumps({'p': position, 'r': 0}).encode()
+        ).decode()
+        for url in (
+            self.TITLES_URL,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+        ):
+            response = client.get(url, {'cursor': cursor})
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что курсор с некорректными значениями '
+                'отклоняется с ответом 404, а не 500.'
+            )
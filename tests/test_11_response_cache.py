@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.checks import check_shared_cache
+from reviews.models import Category
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    @pytest.fixture(params=['locmem', 'filebased'])
+    def api_cache(self, request, settings, tmp_path):
+        backends = {
+            'locmem': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'api-tests',
+            },
+            'filebased': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': str(tmp_path),
+            },
+        }
+        settings.CACHES = {**settings.CACHES, 'api': backends[request.param]}
+        settings.API_CACHE_ALIAS = 'api'
+
+    def test_01_category_list_cached_and_invalidated(
+            self, api_cache, client, admin_client,
+            django_assert_num_queries):
+        Category.objects.create(name='Фильм', slug='films')
+        assert client.get(self.CATEGORIES_URL).json()['count'] == 1
+        with django_assert_num_queries(0):
+            response = client.get(self.CATEGORIES_URL)
+        assert response.json()['count'] == 1, (
+            f'Проверьте, что повторный GET-запрос к `{self.CATEGORIES_URL}` '
+            'обслуживается из кэша.'
+        )
+
+        response = admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Книги', 'slug': 'books'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert client.get(self.CATEGORIES_URL).json()['count'] == 2, (
+            'Проверьте, что создание категории сбрасывает кэш списка.'
+        )
+
+    def test_02_title_cache_follows_reviews(self, api_cache, client,
+                                            admin_client):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        assert client.get(detail_url).json()['rating'] is None
+        assert client.get(self.TITLES_URL).json()['count'] == 2
+
+        create_single_review(admin_client, titles[0]['id'], 'Хорошо', 7)
+        assert client.get(detail_url).json()['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения.'
+        )
+
+        admin_client.delete(detail_url)
+        assert client.get(self.TITLES_URL).json()['count'] == 1
+        assert client.get(detail_url).status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_production_requires_shared_cache(self, settings, tmp_path):
+        settings.API_AUTH_PROFILE = 'production'
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        settings.API_CACHE_ALIAS = 'default'
+        assert [error.id for error in check_shared_cache(None)] == [
+            'api.E001'
+        ], (
+            'Проверьте, что в профиле production кэш в памяти процесса '
+            'отклоняется проверкой api.E001.'
+        )
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        }}
+        assert check_shared_cache(None) == []
+        settings.API_AUTH_PROFILE = 'development'
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        assert check_shared_cache(None) == []
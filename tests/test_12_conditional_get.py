@@ -0,0 +1,176 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Review
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def assert_not_modified(self, client, url, etag, queries):
+        with queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304 без '
+            'обращения к базе данных.'
+        )
+        assert response['ETag'] == etag
+
+    def test_01_reviews_and_comments_etag(self, client, admin_client, admin,
+                                          user_client,
+                                          django_assert_num_queries):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_id = titles[0]['id']
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[0]['id']
+        )
+
+        response = client.get(reviews_url)
+        etag = response['ETag']
+        assert etag.startswith('"') and response['Last-Modified']
+        self.assert_not_modified(
+            client, reviews_url, etag, django_assert_num_queries
+        )
+        comments_etag = client.get(comments_url)['ETag']
+        self.assert_not_modified(
+            client, comments_url, comments_etag, django_assert_num_queries
+        )
+
+        create_single_review(user_client, title_id, 'Новый отзыв', 3)
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый отзыв меняет ETag списка отзывов.'
+        )
+        assert response.json()['count'] == 2
+
+        admin_client.patch(
+            f'{comments_url}{comments[0]["id"]}/', data={'text': 'Правка'}
+        )
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение комментария меняет ETag списка '
+            'комментариев.'
+        )
+
+    def test_02_title_etag(self, client, admin_client, admin,
+                           django_assert_num_queries):
+        _, _, titles = create_comments(admin_client, {admin: admin_client})
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        etag = client.get(detail_url)['ETag']
+        self.assert_not_modified(
+            client, detail_url, etag, django_assert_num_queries
+        )
+
+        admin_client.patch(detail_url, data={'name': 'Другое название'})
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == 'Другое название'
+
+    def test_03_etag_follows_writes_outside_viewsets(self, client,
+                                                     admin_client, user,
+                                                     user_client):
+        _, _, titles = create_comments(admin_client, {user: user_client})
+        title_id = titles[0]['id']
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        etag = client.get(reviews_url)['ETag']
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что отзывы, удалённые вместе с автором, меняют '
+            'ETag списка отзывов.'
+        )
+        assert response.json()['count'] == 0
+
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        etag = client.get(detail_url)['ETag']
+        Category.objects.update(name='Переименовано')
+        Category.objects.first().save()
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение категории через ORM меняет ETag '
+            'произведения.'
+        )
+        assert response.json()['category']['name'] == 'Переименовано'
+
+    def test_04_bulk_changes_reset_etags(self, client, admin_client, admin):
+        _, _, titles = create_comments(admin_client, {admin: admin_client})
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        etag = client.get(detail_url)['ETag']
+        call_command('rebuild_ratings', stdout=StringIO())
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что массовые изменения каталога меняют ETag.'
+        )
+
+    def test_05_author_rename_resets_etags(self, client, admin_client, user,
+                                           user_client):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        title_id = titles[0]['id']
+        urls = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+        )
+        etags = [client.get(url)['ETag'] for url in urls]
+
+        response = user_client.patch(
+            '/api/v1/users/me/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for url, etag in zip(urls, etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что переименование автора меняет ETag отзывов '
+                'и комментариев.'
+            )
+            assert response.json()['results'][0]['author'] == 'renamed'
+
+    def test_06_moved_review_resets_both_etags(self, client, admin_client,
+                                               admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        source, target = (title['id'] for title in titles[:2])
+        urls = {
+            title_id: self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+            for title_id in (source, target)
+        }
+        etags = {
+            title_id: client.get(url)['ETag'] for title_id, url in urls.items()
+        }
+
+        review = Review.objects.get(pk=reviews[0]['id'])
+        review.title_id = target
+        review.save()
+        for title_id, count in ((source, 0), (target, 1)):
+            response = client.get(
+                urls[title_id], HTTP_IF_NONE_MATCH=etags[title_id]
+            )
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что перенос отзыва меняет ETag отзывов '
+                'прежнего и нового произведения.'
+            )
+            assert response.json()['count'] == count
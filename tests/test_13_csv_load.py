@@ -0,0 +1,157 @@
+import gzip
+import os
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.management.commands.csv_load import (DATA_DIR, action,
+                                                  build_levels, parse_chunk,
+                                                  split_file)
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13CsvLoad:
+
+    def test_01_csv_load_is_idempotent(self, django_user_model):
+        out = StringIO()
+        call_command('csv_load', '--batch-size', '7', stdout=out)
+        assert 'строк/с' in out.getvalue(), (
+            'Проверьте, что команда `csv_load` сообщает скорость загрузки.'
+        )
+        counts = (
+            Title.objects.count(), Review.objects.count(),
+            Comment.objects.count(), GenreTitle.objects.count(),
+            django_user_model.objects.count(),
+        )
+        assert all(counts)
+        assert Title.objects.filter(rating__isnull=False).exists(), (
+            'Проверьте, что после загрузки пересчитывается рейтинг.'
+        )
+
+        call_command('csv_load', stdout=StringIO())
+        assert counts == (
+            Title.objects.count(), Review.objects.count(),
+            Comment.objects.count(), GenreTitle.objects.count(),
+            django_user_model.objects.count(),
+        ), 'Проверьте, что повторная загрузка не создаёт дубликатов.'
+
+    def test_02_dependency_levels(self, django_user_model):
+        levels = build_levels([model for model, *_ in action.values()])
+        assert [set(level) for level in levels] == [
+            {Category, Genre, django_user_model},
+            {Title},
+            {Review, GenreTitle},
+            {Comment},
+        ], (
+            'Проверьте, что файлы раскладываются по уровням зависимостей '
+            'внешних ключей.'
+        )
+
+    def test_03_csv_dump_mirrors_csv_load(self, tmp_path):
+        call_command('csv_load', stdout=StringIO())
+        call_command('csv_dump', str(tmp_path), stdout=StringIO())
+        for filename in ('category.csv', 'genre.csv', 'titles.csv',
+                         'users.csv', 'genre_title.csv'):
+            with open(os.path.join(DATA_DIR, filename), 'rb') as file:
+                expected = file.read().replace(b'\r\n', b'\n').rstrip()
+            assert (tmp_path / filename).read_bytes().rstrip() == expected, (
+                f'Проверьте, что `csv_dump` выгружает `{filename}` в '
+                'формате `csv_load`.'
+            )
+
+        call_command('csv_dump', str(tmp_path), '--gzip', stdout=StringIO())
+        assert gzip.decompress(
+            (tmp_path / 'review.csv.gz').read_bytes()
+        ) == (tmp_path / 'review.csv').read_bytes()
+
+    def test_04_export_endpoint(self, admin_client, user_client):
+        call_command('csv_load', stdout=StringIO())
+        url = '/api/v1/export/category.csv'
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            f'Проверьте, что `{url}` доступен только администратору.'
+        )
+        assert admin_client.get(
+            '/api/v1/export/unknown.csv'
+        ).status_code == HTTPStatus.NOT_FOUND
+
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        content = b''.join(response.streaming_content)
+        with open(os.path.join(DATA_DIR, 'category.csv'), 'rb') as file:
+            assert content.rstrip() == file.read().rstrip()
+
+        response = admin_client.get(url, {'gzip': 1})
+        assert gzip.decompress(b''.join(response.streaming_content)) == (
+            content
+        )
+
+    def test_05_chunks_split_by_record(self, tmp_path):
+        path = tmp_path / 'review.csv'
+        path.write_bytes(
+            'id,text,score\r\n'
+            '1,"Первая\r\nстрока ""в кавычках""",5\r\n'
+            'x,Ошибка,1\r\n'
+            '3,Третья,7\r\n'
+            '4,"Многострочный\nотзыв",2\r\n'.encode()
+        )
+        chunks = list(split_file(str(path), 2))
+        assert len(chunks) == 2, (
+            'Проверьте, что файл делится на куски по записям, а не по '
+            'строкам, и перевод строки в кавычках не разрывает запись.'
+        )
+        parsed = [
+            parse_chunk(str(path), *chunk, 3, (0, 2)) for chunk in chunks
+        ]
+        assert [row for rows, _ in parsed for row in rows] == [
+            [1, 'Первая\r\nстрока "в кавычках"', 5],
+            [3, 'Третья', 7],
+            [4, 'Многострочный\nотзыв', 2],
+        ]
+        assert [line for _, invalid in parsed for line in invalid] == [4], (
+            'Проверьте, что номера строк с ошибками считаются от начала '
+            'файла.'
+        )
+
+    def test_06_small_chunks_load_everything(self, django_user_model):
+        call_command('csv_load', '--chunk-rows', '3', stdout=StringIO())
+        counts = (
+            Title.objects.count(), Review.objects.count(),
+            Comment.objects.count(), GenreTitle.objects.count(),
+        )
+        for model in (Comment, GenreTitle, Review, Title):
+            model.objects.all().delete()
+        call_command('csv_load', stdout=StringIO())
+        assert counts == (
+            Title.objects.count(), Review.objects.count(),
+            Comment.objects.count(), GenreTitle.objects.count(),
+        ), 'Проверьте, что загрузка кусками не теряет строки.'
+
+    def test_07_dump_load_round_trip(self, tmp_path, django_user_model):
+        call_command('csv_load', stdout=StringIO())
+        category = Category.objects.filter(category_titles__isnull=False)[0]
+        orphans = set(
+            category.category_titles.values_list('pk', flat=True)
+        )
+        category.delete()
+        call_command('csv_dump', str(tmp_path), stdout=StringIO())
+        expected = set(Title.objects.values_list('pk', 'category_id'))
+
+        for model in (Comment, GenreTitle, Review, Title, Category, Genre):
+            model.objects.all().delete()
+        django_user_model.objects.all().delete()
+        call_command(
+            'csv_load', '--data-dir', str(tmp_path), stdout=StringIO()
+        )
+        assert set(Title.objects.values_list('pk', 'category_id')) == (
+            expected
+        ), (
+            'Проверьте, что после csv_dump и csv_load сохраняются '
+            'произведения без категории.'
+        )
+        assert set(Title.objects.filter(
+            category__isnull=True
+        ).values_list('pk', flat=True)) == orphans
@@ -0,0 +1,74 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from reviews.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_ranked_by_relevance(self, client):
+        Title.objects.create(
+            name='Побег из Шоушенка', year=1994,
+            description='Тюремная драма о надежде.'
+        )
+        Title.objects.create(
+            name='Зелёная миля', year=1999,
+            description='Ещё одна экранизация, снятая после «Побега».'
+        )
+        Title.objects.create(name='Крёстный отец', year=1972)
+
+        assert self.search(client, 'побег') == [
+            'Побег из Шоушенка', 'Зелёная миля'
+        ], (
+            f'Проверьте, что `{self.TITLES_URL}?search=` ищет по названию и '
+            'описанию и ставит совпадения в названии выше.'
+        )
+        assert self.search(client, 'надежд') == ['Побег из Шоушенка']
+        assert self.search(client, '"(*') == []
+
+    def test_02_search_index_follows_updates(self, client, admin_client):
+        title = Title.objects.create(name='Терминатор', year=1984)
+        detail_url = f'{self.TITLES_URL}{title.id}/'
+        admin_client.patch(detail_url, data={'name': 'Чужие'})
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'чужие') == ['Чужие']
+        admin_client.delete(detail_url)
+        assert self.search(client, 'чужие') == []
+
+    def test_03_search_rejects_cursor(self, client):
+        response = client.get(
+            self.TITLES_URL, {'search': 'побег', 'cursor': ''}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что поиск с курсорной пагинацией отклоняется: '
+            'курсор не сохраняет порядок релевантности.'
+        )
+        assert 'cursor' in response.json()
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Триггеры FTS5 есть на SQLite'
+    )
+    def test_04_migrate_restores_triggers(self, client):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER reviews_title_fts_insert')
+        Title.objects.create(name='Терминатор', year=1984)
+        assert self.search(client, 'терминатор') == []
+
+        call_command('migrate', verbosity=0, stdout=StringIO())
+        assert self.search(client, 'терминатор') == ['Терминатор'], (
+            'Проверьте, что migrate восстанавливает триггеры поиска и '
+            'перестраивает индекс.'
+        )
+        Title.objects.create(name='Чужие', year=1986)
+        assert self.search(client, 'чужие') == ['Чужие']
@@ -0,0 +1,54 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        Genre.objects.create(name='Драмеди', slug='drama-comedy')
+        films = Category.objects.create(name='Фильм', slug='films')
+        books = Category.objects.create(name='Книга', slug='books')
+        both = Title.objects.create(name='Оба', year=2000, category=films)
+        both.genre.set([drama, comedy])
+        Title.objects.create(
+            name='Драма', year=2000, category=books
+        ).genre.set([drama])
+        Title.objects.create(
+            name='Комедия', year=2000, category=films
+        ).genre.set([comedy])
+
+    def names(self, client, **params):
+        response = client.get(self.TITLES_URL, params)
+        return sorted(title['name'] for title in response.json()['results'])
+
+    def test_01_genre_any_and_all(self, client, titles):
+        assert self.names(client, genre='drama') == ['Драма', 'Оба'], (
+            'Проверьте, что фильтр `genre` сравнивает слаг целиком.'
+        )
+        assert self.names(client, genre='drama,comedy') == [
+            'Драма', 'Комедия', 'Оба'
+        ], (
+            'Проверьте, что фильтр `genre` со списком слагов возвращает '
+            'каждое произведение один раз.'
+        )
+        assert self.names(
+            client, genre='drama,comedy', genre_match='all'
+        ) == ['Оба']
+        assert self.names(
+            client, genre='drama,unknown', genre_match='all'
+        ) == []
+        assert self.names(client, genre='unknown') == []
+
+    def test_02_category_exact(self, client, titles):
+        assert self.names(client, category='films') == ['Комедия', 'Оба']
+        assert self.names(client, category='films,books') == [
+            'Драма', 'Комедия', 'Оба'
+        ]
+        assert self.names(client, category='film') == []
@@ -0,0 +1,47 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ParentQueries:
+
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_comment_parent_resolved_once(self, admin_client, admin,
+                                             django_assert_num_queries):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        # Отзыв вместе с проверкой произведения, вставка комментария;
+        # пользователь из токена уже в кэше процесса.
+        with django_assert_num_queries(2):
+            response = admin_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.CREATED
+
+        # Отзыв, комментарий вместе с автором, обновление.
+        with django_assert_num_queries(3):
+            response = admin_client.patch(
+                f'{url}{comments[0]["id"]}/', data={'text': 'Правка'}
+            )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_review_must_belong_to_title(self, client, admin_client,
+                                            admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=reviews[0]['id']
+        )
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарии к отзыву, который не относится к '
+            'произведению из URL, недоступны.'
+        )
@@ -0,0 +1,63 @@
+import pytest
+from rest_framework.pagination import PageNumberPagination
+
+from api.pagination import PubDatePagination
+from reviews.models import Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17AuthorQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    # Родительский объект, COUNT для пагинации, страница с авторами.
+    LIST_QUERIES = 3
+
+    @pytest.fixture
+    def page_size(self, request, monkeypatch):
+        pagination = type(
+            'Pagination', (PageNumberPagination,), {'page_size': request.param}
+        )
+        monkeypatch.setattr(PubDatePagination, 'fallback_class', pagination)
+        return request.param
+
+    @pytest.mark.parametrize('page_size', [10, 100, 1000], indirect=True)
+    def test_01_list_authors_in_bounded_queries(
+            self, client, django_user_model, django_assert_num_queries,
+            page_size):
+        django_user_model.objects.bulk_create(
+            django_user_model(
+                username=f'user{idx}', email=f'user{idx}@yamdb.fake'
+            )
+            for idx in range(page_size)
+        )
+        authors = list(django_user_model.objects.order_by('pk'))
+        title = Title.objects.create(name='Произведение', year=2000)
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Отзыв', score=5)
+            for author in authors
+        )
+        review = title.reviews.first()
+        Comment.objects.bulk_create(
+            Comment(review=review, author=author, text='Комментарий')
+            for author in authors
+        )
+
+        for url in (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id
+            ),
+        ):
+            with django_assert_num_queries(self.LIST_QUERIES):
+                response = client.get(url)
+            results = response.json()['results']
+            assert len(results) == page_size
+            assert {obj['author'] for obj in results} == {
+                author.username for author in authors
+            }, (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'имена авторов.'
+            )
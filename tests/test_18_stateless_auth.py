@@ -0,0 +1,140 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.authentication import UserCache, get_access_token
+
+
+def make_client(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18StatelessAuth:
+
+    def test_01_token_contains_claims(self, client, django_user_model):
+        user = django_user_model.objects.create(
+            username='TokenUser', email='token@yamdb.fake',
+            role='moderator', confirmation_code='123456'
+        )
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username, 'confirmation_code': '123456'
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = AccessToken(response.json()['token'])
+        assert (token['username'], token['role'], token['is_staff']) == (
+            'TokenUser', 'moderator', False
+        ), 'Проверьте, что токен содержит имя, роль и признак is_staff.'
+
+    def test_02_permissions_without_user_query(self, admin):
+        admin_client = make_client(admin)
+        admin_client.get('/api/v1/categories/')
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert not any(
+            'users_cinemauser' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что права проверяются по токену без запроса к БД.'
+
+        response = admin_client.get('/api/v1/users/me/')
+        assert response.json()['email'] == admin.email
+
+    def test_03_role_change_revokes_tokens(self, admin, user):
+        admin_client = make_client(admin)
+        user_client = make_client(user)
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        )
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что смена роли отзывает выданные токены.'
+
+        user.refresh_from_db()
+        assert make_client(user).get('/api/v1/users/').status_code == (
+            HTTPStatus.OK
+        )
+
+    def test_04_user_cache_invalidated_by_user_edit(self, admin_client,
+                                                    user, user_client,
+                                                    django_assert_num_queries):
+        assert user_client.get('/api/v1/users/me/').json()['bio'] == (
+            user.bio
+        )
+        with django_assert_num_queries(0):
+            user_client.get('/api/v1/users/me/')
+
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'bio': 'Новое'}
+        )
+        assert user_client.get('/api/v1/users/me/').json()['bio'] == (
+            'Новое'
+        ), 'Проверьте, что изменение пользователя сбрасывает его кэш.'
+
+    def test_05_user_cache_bounds(self, user, admin, monkeypatch):
+        cache = UserCache(maxsize=1, timeout=10)
+        cache.set(user.pk, 0, user)
+        assert cache.get(user.pk, 0) == user
+        assert cache.get(user.pk, 1) is None
+        cache.set(user.pk, 0, user)
+        cache.set(admin.pk, 0, admin)
+        assert cache.get(user.pk, 0) is None
+        monkeypatch.setattr('api.authentication.time.monotonic', lambda: 1e12)
+        assert cache.get(admin.pk, 0) is None
+
+    @pytest.mark.parametrize('field, value', [
+        ('role', 'admin'), ('is_staff', True), ('is_active', False)
+    ])
+    def test_06_orm_access_change_revokes_tokens(self, user, field, value):
+        user_client = make_client(user)
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        )
+        changed = type(user).objects.get(pk=user.pk)
+        setattr(changed, field, value)
+        changed.save(update_fields=[field])
+        assert changed.token_version == user.token_version + 1
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что изменение прав вне API (админка, консоль) '
+            'отзывает выданные токены.'
+        )
+
+    def test_07_other_changes_keep_tokens(self, user):
+        user_client = make_client(user)
+        changed = type(user).objects.get(pk=user.pk)
+        changed.bio = 'Новое'
+        changed.save()
+        assert changed.token_version == user.token_version
+        assert user_client.get('/api/v1/users/me/').json()['bio'] == (
+            'Новое'
+        ), 'Проверьте, что изменение профиля не отзывает токены.'
+
+    def test_08_profile_update_uses_fresh_user(self, user, user_client):
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.OK
+        )
+        type(user).objects.filter(pk=user.pk).update(role='moderator')
+        response = user_client.patch('/api/v1/users/me/', data={'bio': 'Я'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['role'] == 'moderator'
+        user.refresh_from_db()
+        assert (user.role, user.bio) == ('moderator', 'Я'), (
+            'Проверьте, что PATCH `/api/v1/users/me/` сохраняет свежую '
+            'запись из БД, а не копию из кэша.'
+        )
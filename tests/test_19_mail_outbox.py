@@ -0,0 +1,120 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+from users.outbox import deliver_pending
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19MailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    def test_01_signup_enqueues_email(self, client, settings):
+        settings.EMAIL_DELIVERY = 'outbox'
+        outbox_before = len(mail.outbox)
+        response = client.post(self.url_signup, data={
+            'username': 'queued', 'email': 'queued@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == outbox_before, (
+            'Проверьте, что в режиме outbox регистрация не отправляет '
+            'письмо в ходе запроса.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'queued@yamdb.fake'
+        assert email.sent_at is None
+
+        call_command('send_outbox', once=True)
+        assert len(mail.outbox) == outbox_before + 1, (
+            'Проверьте, что команда send_outbox отправляет письма из очереди.'
+        )
+        assert mail.outbox[-1].to == ['queued@yamdb.fake']
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 1
+
+        call_command('send_outbox', once=True)
+        assert len(mail.outbox) == outbox_before + 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно.'
+        )
+
+    def test_02_batches(self, settings):
+        settings.OUTBOX_BATCH_SIZE = 2
+        OutgoingEmail.objects.bulk_create([
+            OutgoingEmail(recipient=f'user{i}@yamdb.fake', subject='s',
+                          body='b')
+            for i in range(5)
+        ])
+        assert deliver_pending() == (2, 0)
+        call_command('send_outbox', once=True, batch_size=2)
+        assert not OutgoingEmail.objects.filter(sent_at=None).exists(), (
+            'Проверьте, что команда разбирает очередь до конца пачками.'
+        )
+
+    def test_03_retry_with_backoff(self, settings, monkeypatch):
+        settings.OUTBOX_MAX_ATTEMPTS = 2
+        settings.OUTBOX_RETRY_DELAY = 30
+        email = OutgoingEmail.objects.create(
+            recipient='retry@yamdb.fake', subject='s', body='b'
+        )
+
+        def fail(self, *args, **kwargs):
+            raise OSError('SMTP недоступен')
+
+        monkeypatch.setattr(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            fail
+        )
+        assert deliver_pending() == (0, 1)
+        email.refresh_from_db()
+        assert email.attempts == 1 and email.sent_at is None
+        assert 'SMTP' in email.last_error
+        assert email.next_attempt_at >= timezone.now() + timedelta(
+            seconds=25
+        ), 'Проверьте, что неудачная отправка откладывается.'
+        assert deliver_pending() == (0, 0), (
+            'Проверьте, что отложенное письмо не отправляется раньше срока.'
+        )
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        assert deliver_pending() == (0, 1)
+        email.refresh_from_db()
+        assert email.next_attempt_at >= timezone.now() + timedelta(
+            seconds=55
+        ), 'Проверьте, что пауза между попытками растёт.'
+
+        monkeypatch.undo()
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        assert deliver_pending() == (0, 0), (
+            'Проверьте, что после OUTBOX_MAX_ATTEMPTS попыток письмо '
+            'больше не отправляется.'
+        )
+
+    def test_04_connection_failure(self, settings, monkeypatch):
+        settings.OUTBOX_RETRY_DELAY = 30
+        OutgoingEmail.objects.bulk_create([
+            OutgoingEmail(recipient=f'user{i}@yamdb.fake', subject='s',
+                          body='b')
+            for i in range(2)
+        ])
+
+        def refuse(self):
+            raise ConnectionRefusedError('SMTP-сервер не отвечает')
+
+        monkeypatch.setattr(
+            'django.core.mail.backends.locmem.EmailBackend.open', refuse
+        )
+        call_command('send_outbox', once=True)
+        for email in OutgoingEmail.objects.all():
+            assert email.attempts == 1 and email.sent_at is None, (
+                'Проверьте, что при недоступном SMTP-сервере пачка '
+                'откладывается, а обработчик не падает.'
+            )
+            assert 'ConnectionRefusedError' in email.last_error
+            assert email.next_attempt_at >= timezone.now() + timedelta(
+                seconds=25
+            )
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20SignupQueries:
+    url_signup = '/api/v1/auth/signup/'
+
+    def signup(self, client, username, email):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.url_signup, data={
+                'username': username, 'email': email
+            })
+        return response, [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith(('SELECT', 'INSERT', 'UPDATE'))
+        ]
+
+    def test_01_new_user(self, client, django_user_model):
+        response, queries = self.signup(client, 'newbie', 'new@yamdb.fake')
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 2, (
+            'Проверьте, что регистрация нового пользователя выполняет один '
+            f'SELECT и один INSERT. Запросы: {queries}'
+        )
+        user = django_user_model.objects.get(username='newbie')
+        assert user.confirmation_code
+
+    def test_02_existing_user(self, client, django_user_model):
+        user = django_user_model.objects.create(
+            username='again', email='again@yamdb.fake'
+        )
+        response, queries = self.signup(client, 'again', 'again@yamdb.fake')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'username': 'again', 'email': 'again@yamdb.fake'
+        }
+        assert len(queries) == 2 and queries[1].startswith('UPDATE'), (
+            'Проверьте, что повторная регистрация сохраняет код одним '
+            f'UPDATE. Запросы: {queries}'
+        )
+        user.refresh_from_db()
+        assert user.confirmation_code
+
+    @pytest.mark.parametrize('username,email,message', [
+        ('taken', 'other@yamdb.fake', 'Данный пользователь уже существует!'),
+        ('newbie', 'taken@yamdb.fake', 'Данная почта уже существует!'),
+        ('other', 'second@yamdb.fake', 'Данный пользователь уже существует!'),
+    ])
+    def test_03_conflicts_in_one_query(self, client, django_user_model,
+                                       username, email, message):
+        django_user_model.objects.create(
+            username='taken', email='taken@yamdb.fake'
+        )
+        django_user_model.objects.create(
+            username='other', email='other@yamdb.fake'
+        )
+        response, queries = self.signup(client, username, email)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert message in str(response.json()), (
+            'Проверьте, что регистрация сообщает о типе конфликта.'
+        )
+        assert len(queries) == 1, (
+            'Проверьте, что конфликт определяется одним запросом. '
+            f'Запросы: {queries}'
+        )
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Throttling:
+    url_signup = '/api/v1/auth/signup/'
+    url_token = '/api/v1/auth/token/'
+
+    @pytest.fixture
+    def user(self, django_user_model):
+        return django_user_model.objects.create(
+            username='guarded', email='guarded@yamdb.fake',
+            confirmation_code='123456'
+        )
+
+    @pytest.mark.parametrize('store', ['locmem', 'cache'])
+    def test_01_username_bucket(self, client, settings, store):
+        settings.API_THROTTLE_STORE = store
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                'signup_ip': '100/m', 'signup_username': '3/m'
+            },
+        }
+        data = {'username': 'storm', 'email': 'storm@yamdb.fake'}
+        for _ in range(3):
+            assert client.post(self.url_signup, data=data).status_code == (
+                HTTPStatus.OK
+            )
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.url_signup, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрация ограничена корзиной токенов по '
+            'имени пользователя.'
+        )
+        assert int(response['Retry-After']) > 0
+        assert not context.captured_queries, (
+            'Проверьте, что отклонённый запрос не обращается к базе данных.'
+        )
+        response = client.post(self.url_signup, data={
+            'username': 'calm', 'email': 'calm@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что корзины разных пользователей независимы.'
+        )
+
+    @pytest.mark.parametrize('store', ['locmem', 'cache'])
+    def test_02_ip_bucket(self, client, settings, user, store):
+        settings.API_THROTTLE_STORE = store
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'token_ip': '2/m'},
+        }
+        for username in ('first', 'second'):
+            response = client.post(self.url_token, data={
+                'username': username, 'confirmation_code': '1'
+            })
+            assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.post(self.url_token, data={
+            'username': user.username, 'confirmation_code': '123456'
+        })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что получение токена ограничено корзиной по IP.'
+        )
+
+    def test_03_attempt_limit(self, client, settings, user):
+        settings.CONFIRMATION_CODE_MAX_ATTEMPTS = 2
+        for _ in range(2):
+            response = client.post(self.url_token, data={
+                'username': user.username, 'confirmation_code': '000000'
+            })
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        user.refresh_from_db()
+        assert user.confirmation_attempts == 2
+        response = client.post(self.url_token, data={
+            'username': user.username, 'confirmation_code': '123456'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что после исчерпания попыток верный код не '
+            'принимается.'
+        )
+
+        client.post(self.url_signup, data={
+            'username': user.username, 'email': user.email
+        })
+        user.refresh_from_db()
+        assert user.confirmation_attempts == 0, (
+            'Проверьте, что новый код сбрасывает счётчик попыток.'
+        )
+        response = client.post(self.url_token, data={
+            'username': user.username,
+            'confirmation_code': user.confirmation_code
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_04_code_expiry(self, client, django_user_model, user):
+        django_user_model.objects.filter(pk=user.pk).update(
+            confirmation_code_issued=timezone.now() - timedelta(days=2)
+        )
+        response = client.post(self.url_token, data={
+            'username': user.username, 'confirmation_code': '123456'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что просроченный код подтверждения не принимается.'
+        )
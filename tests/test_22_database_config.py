@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+from django.db import connection
+
+from api_yamdb.db import check_connections, database_config
+
+
+class Test22DatabaseConfig:
+
+    def test_01_sqlite_defaults(self, monkeypatch):
+        for variable in ('DB_ENGINE', 'DB_NAME', 'DB_CONN_MAX_AGE'):
+            monkeypatch.delenv(variable, raising=False)
+        config = database_config(Path('/srv'))
+        assert config['ENGINE'] == 'django.db.backends.sqlite3'
+        assert config['NAME'] == Path('/srv/db.sqlite3')
+        assert config['CONN_MAX_AGE'] > 0, (
+            'Проверьте, что по умолчанию соединения с БД постоянные.'
+        )
+
+    def test_02_postgres_from_environment(self, monkeypatch):
+        monkeypatch.setenv('DB_ENGINE', 'postgresql')
+        monkeypatch.setenv('DB_NAME', 'yamdb')
+        monkeypatch.setenv('DB_HOST', 'db')
+        monkeypatch.setenv('DB_CONN_MAX_AGE', '300')
+        monkeypatch.setenv('DB_CONN_HEALTH_CHECKS', 'false')
+        config = database_config(Path('/srv'))
+        assert config['ENGINE'] == 'django.db.backends.postgresql'
+        assert (config['NAME'], config['HOST'], config['PORT']) == (
+            'yamdb', 'db', '5432'
+        )
+        assert config['CONN_MAX_AGE'] == 300
+        assert config['CONN_HEALTH_CHECKS'] is False
+
+    @pytest.mark.django_db
+    def test_03_sqlite_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone()[0] == 1, (
+                'Проверьте, что для SQLite включён synchronous=NORMAL.'
+            )
+            cursor.execute('PRAGMA busy_timeout')
+            assert cursor.fetchone()[0] == 5000
+
+    def test_04_health_check_closes_broken_connection(self, monkeypatch):
+        closed = []
+
+        class BrokenConnection:
+            connection = object()
+            settings_dict = {'CONN_HEALTH_CHECKS': True, 'CONN_MAX_AGE': 60}
+            in_atomic_block = False
+
+            def is_usable(self):
+                return False
+
+            def close(self):
+                closed.append(self)
+
+        broken = BrokenConnection()
+        monkeypatch.setattr(
+            'api_yamdb.db.connections.all', lambda: [broken]
+        )
+        check_connections()
+        assert closed == [broken], (
+            'Проверьте, что неработоспособное постоянное соединение '
+            'закрывается в начале запроса.'
+        )
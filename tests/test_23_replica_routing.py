@@ -0,0 +1,115 @@
+import time
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from rest_framework.test import APIClient
+
+from api.authentication import get_access_token
+from api.cache import get_cache
+from api.checks import check_shared_cache
+from api.routing import STICKY_KEY
+from reviews.models import Title
+
+REPLICA = 'replica_test'
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    """Вторая SQLite-база с той же схемой, но без данных основной."""
+    connections.databases[REPLICA] = {
+        **connections['default'].settings_dict,
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+        'TEST': {},
+    }
+    settings.DATABASE_REPLICAS = [REPLICA]
+    call_command('migrate', database=REPLICA, verbosity=0)
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections.databases[REPLICA]
+    if hasattr(connections._connections, REPLICA):
+        delattr(connections._connections, REPLICA)
+
+
+@pytest.fixture
+def settled(monkeypatch, settings):
+    """Окно после изменения данных прошло: реплика успела догнать."""
+    later = time.time() + settings.REPLICA_STICKY_SECONDS + 1
+    monkeypatch.setattr(
+        'api.routing.time', SimpleNamespace(time=lambda: later)
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ReplicaRouting:
+
+    def make_client(self, django_user_model, replica, username):
+        user = django_user_model.objects.create(
+            username=username, email=f'{username}@yamdb.fake'
+        )
+        user.save(using=replica, force_insert=True)
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)}'
+        )
+        return client, user
+
+    def test_01_reads_go_to_replica(self, client, replica, settled):
+        title = Title.objects.create(name='Только в основной', year=2000)
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что GET-запросы читают данные с реплики.'
+        )
+        assert Title.objects.filter(pk=title.pk).exists(), (
+            'Проверьте, что вне HTTP-запроса чтение идёт с основной базы.'
+        )
+
+    def test_02_sticky_primary_after_write(self, django_user_model, replica,
+                                           settled):
+        title = Title.objects.create(name='Новинка', year=2000)
+        writer, user = self.make_client(django_user_model, replica, 'writer')
+        reader, _ = self.make_client(django_user_model, replica, 'reader')
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        response = writer.post(url, data={'text': 'Отзыв', 'score': 8})
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что изменяющие запросы работают с основной базой.'
+        )
+        response = writer.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после своей записи пользователь читает с '
+            'основной базы.'
+        )
+        assert response.json()['count'] == 1
+        assert reader.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что другие пользователи читают с реплики.'
+        )
+
+        get_cache().delete(STICKY_KEY.format(user_id=user.pk))
+        assert writer.get(url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что по истечении окна чтение возвращается на реплику.'
+        )
+
+    def test_03_recent_change_reads_primary(self, client, replica, settings):
+        title = Title.objects.create(name='Новинка', year=2000)
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что сразу после изменения данных запрос читает '
+            'с основной базы, и отстающая реплика не попадает в кэш и ETag.'
+        )
+        response = client.get('/api/v1/titles/')
+        assert response.json()['results'][0]['id'] == title.id
+
+        settings.CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+            }
+        }
+        assert [error.id for error in check_shared_cache(None)] == [
+            'api.E002'
+        ], (
+            'Проверьте, что реплики без общего кэша отклоняются '
+            'проверкой api.E002.'
+        )
@@ -0,0 +1,114 @@
+import asyncio
+import importlib
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, RequestFactory
+from django.urls import clear_url_caches
+from rest_framework.response import Response
+
+from api import async_views
+from api.views import CategoryViewSet
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture
+def async_reads(settings, monkeypatch):
+    """Включает асинхронное чтение и пересобирает маршруты."""
+    import api.urls
+    import api_yamdb.urls
+
+    def reload_urls():
+        importlib.reload(api.urls)
+        importlib.reload(api_yamdb.urls)
+        clear_url_caches()
+
+    settings.API_ASYNC_READS = True
+    settings.API_ASYNC_READ_WORKERS = 4
+    monkeypatch.setattr(async_views, 'read_executor', None)
+    reload_urls()
+    yield
+    settings.API_ASYNC_READS = False
+    reload_urls()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24AsyncReads:
+
+    def test_01_bounded_concurrency(self, async_reads, monkeypatch):
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def slow_list(self, request, *args, **kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.2)
+            with lock:
+                active[0] -= 1
+            return Response([])
+
+        monkeypatch.setattr(CategoryViewSet, 'list', slow_list)
+        view = CategoryViewSet.as_view({'get': 'list'})
+        assert asyncio.iscoroutinefunction(view), (
+            'Проверьте, что при API_ASYNC_READS представление асинхронное.'
+        )
+
+        async def run():
+            factory = RequestFactory()
+            return await asyncio.gather(*(
+                view(factory.get('/api/v1/categories/')) for _ in range(8)
+            ))
+
+        started = time.perf_counter()
+        responses = async_to_sync(run)()
+        elapsed = time.perf_counter() - started
+        assert all(
+            response.status_code == HTTPStatus.OK for response in responses
+        )
+        assert peak[0] == 4, (
+            'Проверьте, что одновременно выполняется не больше '
+            'API_ASYNC_READ_WORKERS запросов.'
+        )
+        assert elapsed < 0.2 * 8 * 0.75, (
+            'Проверьте, что запросы чтения выполняются параллельно.'
+        )
+
+    def test_02_asgi_read_endpoints(self, async_reads, admin_client):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(name='Тест', year=2000,
+                                     category=category)
+        title.genre.add(genre)
+        review = admin_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 7}
+        ).json()
+        admin_client.post(
+            f'/api/v1/titles/{title.id}/reviews/{review["id"]}/comments/',
+            data={'text': 'Комментарий'}
+        )
+
+        urls = {
+            '/api/v1/titles/': 1,
+            '/api/v1/categories/': 1,
+            '/api/v1/genres/': 1,
+            f'/api/v1/titles/{title.id}/reviews/': 1,
+            f'/api/v1/titles/{title.id}/reviews/{review["id"]}/comments/': 1,
+            f'/api/v1/titles/{title.id}/': None,
+        }
+
+        async def run():
+            client = AsyncClient()
+            return [await client.get(url) for url in urls]
+
+        for (url, count), response in zip(urls.items(), async_to_sync(run)()):
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что `{url}` отвечает под ASGI.'
+            )
+            if count is not None:
+                assert response.json()['count'] == count
+        assert response.json()['rating'] == 7
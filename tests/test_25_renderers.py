@@ -0,0 +1,77 @@
+import io
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import FastJSONParser, FastJSONRenderer
+
+SAMPLE = {
+    'count': 2,
+    'results': [
+        {
+            'id': 1,
+            'name': 'Фильм с разделителем',
+            'rating': 7.333333333333333,
+            'score': Decimal('8.5'),
+            'pub_date': datetime(2024, 1, 2, 3, 4, 5, 678901,
+                                 tzinfo=timezone.utc),
+            'genre': [{'name': 'Драма', 'slug': 'drama'}],
+            'description': None,
+            'label': gettext_lazy('Пользователь'),
+        },
+        {'id': 2, 'rating': None, 1: 'ключ-число'},
+    ],
+}
+
+
+@pytest.fixture(params=['orjson', 'fallback'])
+def engine(request, monkeypatch):
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(renderers, 'orjson', None)
+    return request.param
+
+
+class Test25Renderers:
+
+    def test_01_output_matches_json_renderer(self, engine):
+        assert FastJSONRenderer().render(SAMPLE) == (
+            JSONRenderer().render(SAMPLE)
+        ), 'Проверьте, что вывод совпадает с JSONRenderer побайтно.'
+
+    def test_02_indent(self, engine):
+        media_type = 'application/json; indent=4'
+        assert FastJSONRenderer().render(SAMPLE, media_type) == (
+            JSONRenderer().render(SAMPLE, media_type)
+        )
+
+    def test_03_parser(self, engine):
+        body = '{"username": "Пользователь", "score": 7}'.encode()
+        assert FastJSONParser().parse(io.BytesIO(body)) == {
+            'username': 'Пользователь', 'score': 7
+        }
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"broken":'))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_registered_for_api(self, client, admin_client):
+        admin_client.post(
+            '/api/v1/categories/',
+            data=json.dumps({'name': 'Фильм', 'slug': 'movie'}),
+            content_type='application/json',
+        )
+        response = client.get('/api/v1/categories/')
+        assert response['Content-Type'] == 'application/json'
+        assert response.content == JSONRenderer().render(response.data), (
+            'Проверьте, что API отдаёт JSON через FastJSONRenderer.'
+        )
+        assert response.json()['results'] == [
+            {'name': 'Фильм', 'slug': 'movie'}
+        ], 'Проверьте, что JSON в теле запроса разбирается FastJSONParser.'
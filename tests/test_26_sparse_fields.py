@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def title(self, admin):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Произведение', year=2000, description='Описание',
+            category=category
+        )
+        title.genre.add(genre)
+        Review.objects.create(title=title, author=admin, text='Отзыв',
+                              score=8)
+        return title
+
+    def get(self, client, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params)
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_01_title_list_fields(self, client, title):
+        response, queries = self.get(
+            client, self.TITLES_URL, {'fields': 'id,name,rating'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == [
+            {'id': title.id, 'name': title.name, 'rating': 8}
+        ], (
+            'Проверьте, что `?fields=` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        assert len(queries) == 2, (
+            'Проверьте, что без жанров в `?fields=` они не запрашиваются. '
+            f'Запросы: {queries}'
+        )
+        page = queries[-1]
+        assert 'reviews_category' not in page and 'description' not in page, (
+            'Проверьте, что выборка содержит только нужные столбцы.'
+        )
+
+    def test_02_expand(self, client, title):
+        response, queries = self.get(
+            client, self.TITLES_URL, {'fields': 'id', 'expand': 'genre'}
+        )
+        assert response.json()['results'] == [
+            {'id': title.id, 'genre': [{'name': 'Драма', 'slug': 'drama'}]}
+        ], 'Проверьте, что `?expand=` добавляет вложенные объекты.'
+        assert len(queries) == 3
+
+        response = self.get(
+            client, f'{self.TITLES_URL}{title.id}/',
+            {'fields': 'name,category'}
+        )[0]
+        assert response.json() == {
+            'name': title.name,
+            'category': {'name': 'Фильм', 'slug': 'movie'},
+        }
+
+    def test_03_full_response_by_default(self, client, title):
+        result = client.get(self.TITLES_URL).json()['results'][0]
+        assert set(result) == {
+            'id', 'name', 'year', 'rating', 'description', 'genre',
+            'category'
+        }
+
+    def test_04_unknown_fields(self, client, title):
+        response = client.get(self.TITLES_URL, {'fields': 'id,secret'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'fields' in response.json()
+        response = client.get(
+            self.TITLES_URL, {'fields': 'id', 'expand': 'name'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'expand' in response.json()
+
+    def test_05_cursor_pagination(self, client, title):
+        response, queries = self.get(
+            client, self.TITLES_URL, {'fields': 'id', 'cursor': ''}
+        )
+        assert response.json()['results'] == [{'id': title.id}]
+        assert len(queries) == 1, (
+            'Проверьте, что поля сортировки курсора загружаются вместе '
+            f'со страницей. Запросы: {queries}'
+        )
+
+    def test_06_reviews_without_author_join(self, client, title, admin):
+        url = f'{self.TITLES_URL}{title.id}/reviews/'
+        response, queries = self.get(client, url, {'fields': 'id,score'})
+        assert response.json()['results'] == [
+            {'id': title.reviews.get().id, 'score': 8}
+        ]
+        assert 'users_cinemauser' not in queries[-1], (
+            'Проверьте, что без поля `author` автор не присоединяется.'
+        )
+        result = client.get(url, {'fields': 'author'}).json()['results'][0]
+        assert result == {'author': admin.username}
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27FastSerializers:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def title(self, admin, user):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genres = [
+            Genre.objects.create(name='Драма', slug='drama'),
+            Genre.objects.create(name='Комедия', slug='comedy'),
+        ]
+        title = Title.objects.create(
+            name='Произведение', year=2000, description='Описание ',
+            category=category
+        )
+        title.genre.set(genres)
+        Title.objects.create(name='Без категории', year=1999)
+        review = Review.objects.create(title=title, author=admin,
+                                       text='Отзыв', score=8)
+        Review.objects.create(title=title, author=user, text='Ещё', score=7)
+        Title.objects.rebuild_ratings()
+        Comment.objects.create(review=review, author=user, text='Комментарий')
+        return title
+
+    def get_content(self, client, settings, url, params, fast):
+        settings.API_FAST_SERIALIZERS = fast
+        for cache in caches.all():
+            cache.clear()
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        return response.content
+
+    def assert_identical(self, client, settings, url, params=None):
+        fast = self.get_content(client, settings, url, params, True)
+        slow = self.get_content(client, settings, url, params, False)
+        assert fast == slow, (
+            f'Проверьте, что ответ `{url}` с параметрами {params} '
+            'совпадает с ответом ModelSerializer байт в байт.'
+        )
+
+    @pytest.mark.parametrize('params', [
+        None,
+        {'cursor': ''},
+        {'search': 'Произведение'},
+        {'fields': 'id,rating,genre'},
+        {'fields': 'name', 'expand': 'category'},
+    ])
+    def test_01_titles(self, client, settings, title, params):
+        self.assert_identical(client, settings, self.TITLES_URL, params)
+        self.assert_identical(
+            client, settings, f'{self.TITLES_URL}{title.id}/', params
+        )
+
+    @pytest.mark.parametrize('params', [
+        None, {'cursor': ''}, {'fields': 'author,pub_date'}
+    ])
+    def test_02_reviews_and_comments(self, client, settings, title, params):
+        review = title.reviews.get(score=8)
+        url = f'{self.TITLES_URL}{title.id}/reviews/'
+        self.assert_identical(client, settings, url, params)
+        self.assert_identical(client, settings, f'{url}{review.id}/', params)
+        url = f'{url}{review.id}/comments/'
+        self.assert_identical(client, settings, url, params)
+        self.assert_identical(
+            client, settings, f'{url}{review.comments.get().id}/', params
+        )
+
+    def test_03_queries(self, client, settings, title):
+        settings.API_FAST_SERIALIZERS = True
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.TITLES_URL, {'cursor': ''})
+        assert len(context.captured_queries) == 2, (
+            'Проверьте, что страница произведений загружается одним '
+            'запросом, а жанры всей страницы — ещё одним.'
+        )
+        assert 'rating_sum' not in context.captured_queries[0]['sql'], (
+            'Проверьте, что страница читается только нужными столбцами.'
+        )
+
+    def test_04_writes_use_model_serializer(self, admin_client, title):
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{title.id}/', data={'name': 'Новое название'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['genre'] == [
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ]
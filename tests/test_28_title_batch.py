@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28TitleBatch:
+
+    BATCH_URL = '/api/v1/titles/batch/'
+
+    @pytest.fixture
+    def titles(self, admin):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        titles = [
+            Title.objects.create(
+                name=f'Произведение {number}', year=2000, category=category
+            )
+            for number in range(3)
+        ]
+        for title in titles:
+            title.genre.add(genre)
+        Review.objects.create(title=titles[1], author=admin, text='Отзыв',
+                              score=9)
+        Title.objects.rebuild_ratings()
+        return titles
+
+    def get_ids(self, titles, *indexes):
+        return ','.join(str(titles[index].id) for index in indexes)
+
+    @pytest.mark.parametrize('fast', [True, False])
+    def test_01_order_and_missing(self, client, settings, titles, fast):
+        settings.API_FAST_SERIALIZERS = fast
+        missing = titles[-1].id + 100
+        ids = f'{self.get_ids(titles, 2, 0, 1)},{missing},{titles[2].id}'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.BATCH_URL, {'ids': ids})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            titles[2].id, titles[0].id, titles[1].id
+        ], (
+            'Проверьте, что произведения возвращаются в порядке `?ids=` '
+            'без повторов.'
+        )
+        assert data['missing'] == [missing], (
+            'Проверьте, что отсутствующие id перечислены в `missing`.'
+        )
+        assert len(context.captured_queries) == 2, (
+            'Проверьте, что произведения загружаются одним запросом, '
+            'а жанры — ещё одним.'
+        )
+        for result in data['results']:
+            assert result == client.get(
+                f'/api/v1/titles/{result["id"]}/'
+            ).json(), (
+                'Проверьте, что формат произведений совпадает с '
+                'ответом на запрос одного произведения.'
+            )
+
+    @pytest.mark.parametrize('ids', [
+        '', ',', 'abc', '1,-2', '1.5', '99999999999999999999'
+    ])
+    def test_02_invalid_ids(self, client, titles, ids):
+        response = client.get(self.BATCH_URL, {'ids': ids})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'ids' in response.json()
+
+    def test_03_max_size(self, client, titles):
+        ids = [title.id for title in titles] + list(
+            range(titles[-1].id + 1, titles[-1].id + 99)
+        )
+        response = client.get(
+            self.BATCH_URL, {'ids': ','.join(map(str, ids))}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что за один запрос можно получить не больше '
+            '100 произведений.'
+        )
+        response = client.get(
+            self.BATCH_URL, {'ids': ','.join(map(str, ids[:100]))}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == len(titles)
+        assert len(response.json()['missing']) == 100 - len(titles)
+
+    def test_04_cache_invalidation(self, client, admin_client, titles):
+        ids = self.get_ids(titles, 0)
+        assert client.get(self.BATCH_URL, {'ids': ids}).json()['results']
+        response = admin_client.delete(f'/api/v1/titles/{titles[0].id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        data = client.get(self.BATCH_URL, {'ids': ids}).json()
+        assert data == {'results': [], 'missing': [titles[0].id]}, (
+            'Проверьте, что удалённое произведение не остаётся в кэше.'
+        )